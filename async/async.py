@@ -1,43 +1,138 @@
+import argparse
 import asyncio
-import aiohttp
-
-JOKE_API = 'https://official-joke-api.appspot.com/random_joke'
-QUOTE_API = 'https://zenquotes.io/api/random'
-TRIVIA_API = 'https://opentdb.com/api.php?amount=1'
-
-
-async def get_joke(session):
-    async with session.get(JOKE_API) as resp:
-        data = await resp.json()
-        return f"{data['setup']} ... {data['punchline']}"
-
-    
-async def get_quote(session):
-    async with session.get(QUOTE_API) as resp:
-        data = await resp.json()
-        return f"“{data[0]['q']}” — {data[0]['a']}"
-
-    
-async def get_trivia(session):
-    async with session.get(TRIVIA_API) as resp:
-        data = await resp.json()
-        result = data['results'][0]
-        question = result['question']
-        answer = result['correct_answer']
-        return f"Q: {question} | A: {answer}"
-
-    
-async def main():
-    async with aiohttp.ClientSession() as session:
-        joke_task = get_joke(session)
-        quote_task = get_quote(session)
-        trivia_task = get_trivia(session)
-
-        joke, quote, trivia = await asyncio.gather(joke_task, quote_task, trivia_task)
-
-        print('Joke:', joke)
-        print('Quote:', quote)
-        print('Trivia:', trivia)
-
-        
-asyncio.run(main())
+import os
+import time
+
+from fetcher import Fetcher
+from http_cache import CachedFetcher, DiskCache, ItemPool
+
+JOKE_API = os.getenv('JOKE_API', 'https://official-joke-api.appspot.com/random_joke')
+QUOTE_API = os.getenv('QUOTE_API', 'https://zenquotes.io/api/random')
+TRIVIA_API = os.getenv('TRIVIA_API', 'https://opentdb.com/api.php?amount=1')
+CACHE_DIR = os.getenv('ASYNC_CACHE_DIR', '.cache')
+
+# Published limits of the public APIs: (requests per second, burst).
+RATE_LIMITS = {
+    'official-joke-api.appspot.com': (10, 10),
+    'zenquotes.io': (5 / 30, 5),
+    'opentdb.com': (1 / 5, 1),
+}
+
+
+def format_joke(data):
+    return f"{data['setup']} ... {data['punchline']}"
+
+
+def format_quote(data):
+    return f"“{data[0]['q']}” — {data[0]['a']}"
+
+
+def format_trivia(data):
+    result = data['results'][0]
+    question = result['question']
+    answer = result['correct_answer']
+    return f"Q: {question} | A: {answer}"
+
+
+def pool_path(kind):
+    return os.path.join(CACHE_DIR, f'pool_{kind}.json')
+
+
+def open_pools():
+    '''One ItemPool per kind for the whole run; call flush() on each when done.'''
+    return {kind: ItemPool(pool_path(kind)) for kind in ('joke', 'quote', 'trivia')}
+
+
+async def _get(fetcher, url, kind, formatter, pools=None):
+    # Prefetched items are served first: no network round-trip at all.
+    if pools:
+        item = pools[kind].take()
+        if item is not None:
+            return formatter(item)
+    return formatter(await fetcher.get_json(url))
+
+
+async def get_joke(fetcher, pools=None):
+    return await _get(fetcher, JOKE_API, 'joke', format_joke, pools)
+
+
+async def get_quote(fetcher, pools=None):
+    return await _get(fetcher, QUOTE_API, 'quote', format_quote, pools)
+
+
+async def get_trivia(fetcher, pools=None):
+    return await _get(fetcher, TRIVIA_API, 'trivia', format_trivia, pools)
+
+
+async def prefetch(fetcher, size):
+    '''Fill each on-disk pool with `size` distinct items ahead of time.'''
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for kind, url in (('joke', JOKE_API), ('quote', QUOTE_API), ('trivia', TRIVIA_API)):
+        pool = ItemPool(pool_path(kind))
+        n = await pool.fill(lambda: fetcher.get_json(url), size)
+        print(f'{kind}: {n} items in {pool_path(kind)}')
+
+
+async def fetch_batch(fetcher, count, pools=None):
+    '''Fetch `count` of each item concurrently -> (jokes, quotes, trivia); failed fetches are dropped.'''
+    getters = (get_joke, get_quote, get_trivia)
+    results = await asyncio.gather(*(g(fetcher, pools) for g in getters for _ in range(count)),
+                                   return_exceptions=True)
+    groups = [results[i * count:(i + 1) * count] for i in range(len(getters))]
+    return tuple([r for r in group if not isinstance(r, Exception)] for group in groups)
+
+
+async def main(args):
+    global JOKE_API, QUOTE_API, TRIVIA_API
+    runner = None
+    pools = None
+    fetcher_args = {'rate_limits': RATE_LIMITS}
+    if args.stub:
+        import stub_server
+
+        runner, base = await stub_server.start(fail_every=args.fail_every)
+        JOKE_API, QUOTE_API, TRIVIA_API = f'{base}/random_joke', f'{base}/api/random', f'{base}/api.php?amount=1'
+        fetcher_args = {'default_rate': None, 'limit_per_host': 50, 'backoff_base': 0.01}
+    fetcher = Fetcher(**fetcher_args)
+    # Pools need distinct items, so prefetching bypasses the HTTP cache.
+    if args.cache_ttl is not None and not args.prefetch:
+        fetcher = CachedFetcher(fetcher, DiskCache(os.path.join(CACHE_DIR, 'http')),
+                                ttl=args.cache_ttl, stale_while_revalidate=args.swr)
+    try:
+        async with fetcher:
+            if args.prefetch:
+                await prefetch(fetcher, args.prefetch)
+                return
+            if args.pool:
+                pools = open_pools()
+            start = time.perf_counter()
+            jokes, quotes, trivia = await fetch_batch(fetcher, args.count, pools)
+            elapsed = time.perf_counter() - start
+
+            if args.count == 1:
+                print('Joke:', jokes[0] if jokes else '(failed)')
+                print('Quote:', quotes[0] if quotes else '(failed)')
+                print('Trivia:', trivia[0] if trivia else '(failed)')
+            else:
+                ok = len(jokes) + len(quotes) + len(trivia)
+                print(f'Fetched {ok}/{3 * args.count} items in {elapsed:.2f}s')
+            stats = fetcher.stats_summary if isinstance(fetcher, CachedFetcher) else fetcher.stats
+            print('Stats:', stats)
+    finally:
+        for pool in (pools or {}).values():
+            pool.flush()
+        if runner is not None:
+            await runner.cleanup()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fetch jokes, quotes and trivia concurrently.')
+    parser.add_argument('--count', type=int, default=1, help='items of each kind to fetch')
+    parser.add_argument('--stub', action='store_true', help='use a local stand-in server instead of the real APIs')
+    parser.add_argument('--fail-every', type=int, default=0, help='with --stub: answer every Nth request with 429/503')
+    parser.add_argument('--cache-ttl', type=float, help=f'serve responses from the HTTP cache in {CACHE_DIR}/http '
+                                                        'for this many seconds, then revalidate')
+    parser.add_argument('--swr', action='store_true', help='with --cache-ttl: serve stale entries while revalidating')
+    parser.add_argument('--prefetch', type=int, metavar='N', help='fill on-disk pools with N items of each kind and exit')
+    parser.add_argument('--pool', action='store_true', help='serve items from the prefetched pools first')
+    asyncio.run(main(parser.parse_args()))
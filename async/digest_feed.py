@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import csv
+import html
+import importlib
+import os
+import tempfile
+
+from fetcher import Fetcher
+
+# async.py can't be imported with a plain `import` statement (async is a keyword).
+apis = importlib.import_module('async')
+
+DIGEST_DIR = os.getenv('DIGEST_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'week8'))
+QUOTES_FILE = 'quotes.csv'
+FUN_FILE = 'fun.csv'
+QUOTES_FIELDS = ['quote', 'author']
+FUN_FIELDS = ['type', 'content']
+_IDLE = object()  # queue.get timed out: flush what we have
+
+
+def joke_row(data):
+    return FUN_FILE, {'type': 'joke', 'content': f"{data['setup']} {data['punchline']}"}
+
+
+def quote_row(data):
+    return QUOTES_FILE, {'quote': data[0]['q'], 'author': data[0]['a']}
+
+
+def trivia_row(data):
+    result = data['results'][0]
+    # Open Trivia DB HTML-escapes its text.
+    question = html.unescape(result['question'])
+    answer = html.unescape(result['correct_answer'])
+    return FUN_FILE, {'type': 'fact', 'content': f'{question} Answer: {answer}'}
+
+
+def row_key(filename, row):
+    text = row['quote'] if filename == QUOTES_FILE else row['content']
+    return ' '.join(text.lower().split())
+
+
+class DigestWriter:
+    '''Appends new rows to the digest CSVs, skipping anything already present.'''
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.fields = {QUOTES_FILE: QUOTES_FIELDS, FUN_FILE: FUN_FIELDS}
+        self.seen = {name: self._existing_keys(name) for name in self.fields}
+        self.written = {name: 0 for name in self.fields}
+        self.duplicates = 0
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def _existing_keys(self, filename):
+        path = self._path(filename)
+        if not os.path.exists(path):
+            return set()
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return {row_key(filename, r) for r in csv.DictReader(f)}
+
+    def write_batch(self, rows):
+        by_file = {}
+        for filename, row in rows:
+            key = row_key(filename, row)
+            if key in self.seen[filename]:
+                self.duplicates += 1
+                continue
+            self.seen[filename].add(key)
+            by_file.setdefault(filename, []).append(row)
+        for filename, new_rows in by_file.items():
+            path = self._path(filename)
+            exists = os.path.exists(path) and os.path.getsize(path) > 0
+            if exists:
+                with open(path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) not in (b'\n', b'\r')
+            with open(path, 'a', encoding='utf-8', newline='') as f:
+                if exists and needs_newline:
+                    f.write('\n')
+                w = csv.DictWriter(f, fieldnames=self.fields[filename])
+                if not exists:
+                    w.writeheader()
+                w.writerows(new_rows)
+            self.written[filename] += len(new_rows)
+
+
+async def producer(fetcher, url, to_row, count, queue):
+    '''Fetch `count` items concurrently and push (file, row) pairs; blocks when the queue is full.'''
+    async def one():
+        try:
+            data = await fetcher.get_json(url)
+            await queue.put(to_row(data))
+        except Exception as e:
+            print(f'[WARN] fetch failed for {url}: {e}')
+
+    await asyncio.gather(*(one() for _ in range(count)))
+
+
+async def consumer(queue, writer, batch_size, flush_seconds):
+    '''Drain the queue and write in batches of `batch_size` (or whatever arrived within `flush_seconds`).'''
+    batch = []
+    while True:
+        try:
+            item = await asyncio.wait_for(queue.get(), timeout=flush_seconds)
+        except asyncio.TimeoutError:
+            item = _IDLE
+        if item is not None and item is not _IDLE:
+            batch.append(item)
+        if batch and (item is None or item is _IDLE or len(batch) >= batch_size):
+            # File I/O off the event loop so producers keep fetching meanwhile.
+            await asyncio.to_thread(writer.write_batch, batch)
+            batch = []
+        if item is None:
+            return
+
+
+async def run_feed(fetcher, count, directory=DIGEST_DIR, queue_size=100, batch_size=25, flush_seconds=1.0):
+    queue = asyncio.Queue(maxsize=queue_size)
+    writer = DigestWriter(directory)
+    consume = asyncio.create_task(consumer(queue, writer, batch_size, flush_seconds))
+    await asyncio.gather(
+        producer(fetcher, apis.JOKE_API, joke_row, count, queue),
+        producer(fetcher, apis.QUOTE_API, quote_row, count, queue),
+        producer(fetcher, apis.TRIVIA_API, trivia_row, count, queue),
+    )
+    await queue.put(None)
+    await consume
+    return writer
+
+
+async def main(args):
+    runner = None
+    fetcher_args = {'rate_limits': apis.RATE_LIMITS}
+    if args.stub:
+        import stub_server
+
+        runner, base = await stub_server.start()
+        apis.JOKE_API = f'{base}/random_joke'
+        apis.QUOTE_API = f'{base}/api/random'
+        apis.TRIVIA_API = f'{base}/api.php?amount=1'
+        fetcher_args = {'limit_per_host': 50}
+    if args.dir is None:
+        # Stub rows must never end up in the real digest files.
+        args.dir = tempfile.mkdtemp(prefix='digest_stub_') if args.stub else DIGEST_DIR
+    try:
+        async with Fetcher(**fetcher_args) as fetcher:
+            writer = await run_feed(fetcher, args.count, args.dir, args.queue_size, args.batch_size)
+        print(f'Added {writer.written[QUOTES_FILE]} quotes and {writer.written[FUN_FILE]} jokes/facts '
+              f'to {os.path.abspath(args.dir)} ({writer.duplicates} duplicates skipped)')
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fetch fresh quotes, jokes and trivia into the daily digest CSVs.')
+    parser.add_argument('--count', type=int, default=10, help='items of each kind to fetch')
+    parser.add_argument('--dir', help=f'folder holding quotes.csv and fun.csv (default: {DIGEST_DIR}, '
+                                      'or a new temporary folder with --stub)')
+    parser.add_argument('--queue-size', type=int, default=100, help='max rows buffered between fetchers and writer')
+    parser.add_argument('--batch-size', type=int, default=25, help='rows per CSV append')
+    parser.add_argument('--stub', action='store_true', help='use the local stand-in server instead of the real APIs')
+    asyncio.run(main(parser.parse_args()))
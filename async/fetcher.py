@@ -0,0 +1,117 @@
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    '''Allow `rate` requests per second on average, with bursts of up to `burst`.'''
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Fetcher:
+    '''Reusable JSON fetcher: pooled connections, per-host rate limits, timeouts and retries.
+
+    rate_limits maps a host name to (requests per second, burst); hosts not listed
+    use default_rate (None = unlimited). 429 and 5xx responses, timeouts and
+    connection errors are retried with exponential backoff plus jitter, honouring
+    Retry-After when the server sends one.
+
+        async with Fetcher(rate_limits={'zenquotes.io': (5 / 30, 5)}) as f:
+            data = await f.get_json('https://zenquotes.io/api/random')
+    '''
+
+    def __init__(self, rate_limits=None, default_rate=None, limit=100, limit_per_host=10,
+                 timeout=10.0, retries=4, backoff_base=0.5, backoff_max=30.0):
+        self.rate_limits = dict(rate_limits or {})
+        self.default_rate = default_rate
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = None
+        self.buckets = {}
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0}
+
+    async def __aenter__(self):
+        # One connector = one pool per host, capped per host and overall.
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    def bucket(self, host):
+        if host not in self.buckets:
+            limit = self.rate_limits.get(host, self.default_rate)
+            if limit is None:
+                self.buckets[host] = None
+            else:
+                rate, burst = limit if isinstance(limit, tuple) else (limit, 1)
+                self.buckets[host] = TokenBucket(rate, burst)
+        return self.buckets[host]
+
+    def backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def request(self, url, headers=None):
+        '''GET with rate limiting and retries -> (status, response headers, JSON body or None for 304).'''
+        bucket = self.bucket(urlsplit(url).hostname)
+        for attempt in range(self.retries + 1):
+            if bucket is not None:
+                await bucket.acquire()
+            self.stats['requests'] += 1
+            retry_after = None
+            try:
+                async with self.session.get(url, headers=headers) as resp:
+                    if resp.status not in RETRY_STATUSES:
+                        resp.raise_for_status()
+                        body = None if resp.status == 304 else await resp.json(content_type=None)
+                        return resp.status, resp.headers, body
+                    error = aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status,
+                                                        message=resp.reason or '')
+                    header = resp.headers.get('Retry-After')
+                    if header and header.isdigit():
+                        retry_after = float(header)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+            if attempt == self.retries:
+                break
+            self.stats['retries'] += 1
+            await asyncio.sleep(self.backoff(attempt, retry_after))
+        self.stats['failures'] += 1
+        raise error
+
+    async def get_json(self, url):
+        return (await self.request(url))[2]
+
+    async def get_many(self, urls):
+        '''Fetch every URL concurrently -> list of JSON bodies or exceptions, in input order.'''
+        return await asyncio.gather(*(self.get_json(u) for u in urls), return_exceptions=True)
@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+
+def _write_json(path, data):
+    # Write-then-rename so a crash or a concurrent reader never sees half a file.
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read_json(path, default=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+class DiskCache:
+    '''One JSON file per URL holding the last body plus its validators (ETag / Last-Modified).'''
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        return _read_json(self.path(url))
+
+    def put(self, url, body, etag=None, last_modified=None):
+        entry = {'url': url, 'body': body, 'etag': etag, 'last_modified': last_modified, 'stored_at': time.time()}
+        _write_json(self.path(url), entry)
+        return entry
+
+    def touch(self, entry):
+        '''Mark an entry fresh again after a 304 Not Modified.'''
+        entry['stored_at'] = time.time()
+        _write_json(self.path(entry['url']), entry)
+
+
+class CachedFetcher:
+    '''Wraps a Fetcher with an on-disk HTTP cache; same `get_json` interface.
+
+    - Entries younger than `ttl` seconds are served without touching the network.
+    - Older entries are revalidated with If-None-Match / If-Modified-Since; a 304
+      keeps the cached body.
+    - With `stale_while_revalidate=True`, an expired entry is returned at once
+      and revalidated in the background for the next caller.
+    '''
+
+    def __init__(self, fetcher, cache, ttl=300.0, stale_while_revalidate=False):
+        self.fetcher = fetcher
+        self.cache = cache
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stats = {'fresh': 0, 'stale': 0, 'revalidated': 0, 'fetched': 0}
+        self._background = set()
+
+    async def __aenter__(self):
+        await self.fetcher.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        await self.fetcher.__aexit__(*exc)
+
+    async def get_json(self, url):
+        entry = self.cache.get(url)
+        if entry is not None:
+            if time.time() - entry['stored_at'] < self.ttl:
+                self.stats['fresh'] += 1
+                return entry['body']
+            if self.stale_while_revalidate:
+                self.stats['stale'] += 1
+                task = asyncio.create_task(self._revalidate(url, entry))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+                return entry['body']
+        return (await self._revalidate(url, entry))['body']
+
+    async def _revalidate(self, url, entry):
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        status, resp_headers, body = await self.fetcher.request(url, headers=headers or None)
+        if status == 304 and entry is not None:
+            self.stats['revalidated'] += 1
+            self.cache.touch(entry)
+            return entry
+        self.stats['fetched'] += 1
+        return self.cache.put(url, body, resp_headers.get('ETag'), resp_headers.get('Last-Modified'))
+
+    @property
+    def stats_summary(self):
+        return {**self.stats, **{f'http_{k}': v for k, v in self.fetcher.stats.items()}}
+
+
+class ItemPool:
+    '''On-disk pool of prefetched, de-duplicated items for one kind of content.
+
+    `fill` fetches until `size` distinct items are stored; `take` pops one
+    without any network call (None when the pool is empty). Taken items are
+    only removed from disk by `flush`, so a run can take many items for one
+    write of the pool file.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.items = _read_json(path, default=[])
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.items)
+
+    def _save(self):
+        _write_json(self.path, self.items)
+
+    async def fill(self, fetch, size, max_attempts=None):
+        '''Call `fetch()` concurrently until the pool holds `size` distinct items.'''
+        seen = {json.dumps(i, sort_keys=True) for i in self.items}
+        attempts = 0
+        max_attempts = max_attempts or 3 * size
+        while len(self.items) < size and attempts < max_attempts:
+            want = min(size - len(self.items), max_attempts - attempts)
+            attempts += want
+            for item in await asyncio.gather(*(fetch() for _ in range(want)), return_exceptions=True):
+                if isinstance(item, Exception):
+                    continue
+                key = json.dumps(item, sort_keys=True)
+                if key not in seen and len(self.items) < size:
+                    seen.add(key)
+                    self.items.append(item)
+        self._save()
+        return len(self.items)
+
+    def take(self):
+        if not self.items:
+            return None
+        self._dirty = True
+        return self.items.pop(0)
+
+    def flush(self):
+        '''Write the pool back if items were taken since it was loaded or last flushed.'''
+        if self._dirty:
+            self._save()
+            self._dirty = False
@@ -0,0 +1,74 @@
+import argparse
+import hashlib
+import itertools
+import json
+
+from aiohttp import web
+
+# Local stand-in for the joke / quote / trivia APIs, for load and retry testing.
+# Every `fail_every`-th request gets a 429 or 503, so the fetcher's retry path is exercised too.
+# Content rotates through VARIANTS items and carries an ETag, so caching and pools can be tested.
+VARIANTS = 50
+
+
+def respond(request, data):
+    etag = '"' + hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest() + '"'
+    if request.headers.get('If-None-Match') == etag:
+        return web.Response(status=304, headers={'ETag': etag})
+    return web.json_response(data, headers={'ETag': etag})
+
+
+def make_app(fail_every=0, variants=VARIANTS):
+    counter = itertools.count(1)
+    state = {'hits': 0}  # mutable: aiohttp freezes app[...] once the server starts
+    app = web.Application()
+    app['state'] = state
+
+    def maybe_fail(request):
+        n = next(counter)
+        state['hits'] = n
+        if fail_every and n % fail_every == 0:
+            status = 429 if n % (2 * fail_every) == 0 else 503
+            return web.Response(status=status, headers={'Retry-After': '0'})
+        return None
+
+    async def joke(request):
+        failed = maybe_fail(request)
+        n = state['hits'] % variants
+        return failed or respond(request, {
+            'id': n, 'type': 'general', 'setup': f'Why did stub #{n} cross the road?', 'punchline': 'To get tested.'})
+
+    async def quote(request):
+        failed = maybe_fail(request)
+        n = state['hits'] % variants
+        return failed or respond(request, [{'q': f'Fast is fine, but accuracy is everything. (#{n})',
+                                                         'a': 'Wyatt Earp'}])
+
+    async def trivia(request):
+        failed = maybe_fail(request)
+        n = state['hits'] % variants
+        return failed or respond(request, {
+            'response_code': 0, 'results': [{'question': f'Is stub #{n} a stub?', 'correct_answer': 'True'}]})
+
+    app.router.add_get('/random_joke', joke)
+    app.router.add_get('/api/random', quote)
+    app.router.add_get('/api.php', trivia)
+    return app
+
+
+async def start(host='127.0.0.1', port=0, fail_every=0, variants=VARIANTS):
+    '''Run the stand-in server in the current event loop -> (runner, base URL).'''
+    runner = web.AppRunner(make_app(fail_every, variants))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://{host}:{port}'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stand-in joke/quote/trivia API server.')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--fail-every', type=int, default=0, help='answer every Nth request with 429/503')
+    args = parser.parse_args()
+    web.run_app(make_app(args.fail_every), host='127.0.0.1', port=args.port)
@@ -0,0 +1,110 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import stub_server  # noqa: E402
+from fetcher import Fetcher  # noqa: E402
+from http_cache import CachedFetcher, DiskCache  # noqa: E402
+
+
+def run_with_stub(test, **stub_args):
+    '''Start the stub server, run `await test(base_url, state)` against it, shut it down.'''
+    async def main():
+        runner, base = await stub_server.start(**stub_args)
+        try:
+            return await test(base, runner.app['state'])
+        finally:
+            await runner.cleanup()
+    return asyncio.run(main())
+
+
+def test_token_bucket_spaces_requests_after_the_burst():
+    async def test(base, state):
+        async with Fetcher(default_rate=(20, 3)) as f:
+            start = time.perf_counter()
+            results = await f.get_many([f'{base}/random_joke'] * 3)
+            burst = time.perf_counter() - start
+            await f.get_many([f'{base}/random_joke'] * 4)
+            total = time.perf_counter() - start
+        return results, burst, total, state['hits']
+
+    results, burst, total, hits = run_with_stub(test)
+    assert all(isinstance(r, dict) for r in results)
+    assert hits == 7
+    assert burst < 0.1  # the first `burst` requests go out at once
+    assert total >= 4 / 20 * 0.9  # the rest wait for tokens at 20 per second
+
+
+def test_retries_recover_from_429_and_503():
+    async def test(base, state):
+        async with Fetcher(backoff_base=0.01) as f:
+            results = [await f.get_json(f'{base}/api/random') for _ in range(6)]
+            stats = dict(f.stats)
+        async with Fetcher(retries=0) as f:
+            failed = await f.get_many([f'{base}/api/random'] * 4)
+        return results, stats, failed
+
+    results, stats, failed = run_with_stub(test, fail_every=2)
+    assert all(r[0]['a'] == 'Wyatt Earp' for r in results)
+    # Every 2nd hit fails: all but the first call needs exactly one retry.
+    assert stats['retries'] == 5 and stats['failures'] == 0
+    assert stats['requests'] == 11
+    statuses = sorted(e.status for e in failed if isinstance(e, aiohttp.ClientResponseError))
+    assert statuses == [429, 503]
+
+
+def test_cache_serves_fresh_entries_and_revalidates_with_etag(tmp_path):
+    async def test(base, state):
+        url = f'{base}/random_joke'
+        async with CachedFetcher(Fetcher(), DiskCache(str(tmp_path)), ttl=60) as f:
+            first = await f.get_json(url)
+            fresh = await f.get_json(url)
+            fresh_stats = f.stats_summary
+        async with CachedFetcher(Fetcher(), DiskCache(str(tmp_path)), ttl=0) as f:
+            revalidated = await f.get_json(url)
+            stats = f.stats_summary
+        return first, fresh, revalidated, fresh_stats, stats
+
+    first, fresh, revalidated, fresh_stats, stats = run_with_stub(test, variants=1)
+    assert first == fresh == revalidated
+    assert fresh_stats['fetched'] == 1 and fresh_stats['fresh'] == 1 and fresh_stats['http_requests'] == 1
+    # Expired entry: one conditional request, answered 304, cached body kept.
+    assert stats['revalidated'] == 1 and stats['fetched'] == 0 and stats['http_requests'] == 1
+
+
+def test_stale_while_revalidate_returns_cached_body_and_refreshes_in_background(tmp_path):
+    async def test(base, state):
+        url = f'{base}/api.php?amount=1'
+        cache = DiskCache(str(tmp_path))
+        async with CachedFetcher(Fetcher(), cache, ttl=0) as f:
+            first = await f.get_json(url)
+        async with CachedFetcher(Fetcher(), cache, ttl=0, stale_while_revalidate=True) as f:
+            hits_before = state['hits']
+            stale = await f.get_json(url)
+            answered_from_cache = state['hits'] == hits_before
+        # Leaving the context waits for the background revalidation.
+        return first, stale, answered_from_cache, f.stats, cache.get(url)['body']
+
+    first, stale, answered_from_cache, stats, refreshed = run_with_stub(test)
+    assert stale == first and answered_from_cache
+    assert stats['stale'] == 1 and stats['fetched'] == 1
+    assert refreshed != first  # the stub rotates content, so the refresh stored a new body
+
+
+@pytest.mark.parametrize('fail_every', [0, 3])
+def test_get_many_keeps_input_order(fail_every):
+    async def test(base, state):
+        urls = [f'{base}/random_joke', f'{base}/api/random', f'{base}/api.php?amount=1'] * 3
+        async with Fetcher(backoff_base=0.01) as f:
+            return await f.get_many(urls)
+
+    results = run_with_stub(test, fail_every=fail_every)
+    assert [type(r) for r in results] == [dict, list, dict] * 3
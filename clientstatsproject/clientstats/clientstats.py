@@ -1,9 +1,22 @@
-import matplotlib
-import matplotlib.pyplot as plt
+import os
+import sys
+
 import seaborn as sns
 import pandas as pd
 
-matplotlib.use('Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import figure_jobs  # noqa: E402
+
+figures = []
+
+
+def draw_counts_bar(ax, spec):
+    counts, title, xlabel = spec
+    sns.barplot(x=counts.index, y=counts.values, ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Type')
+
 
 def print_divider(str):
     print('---------------------------------')
@@ -72,14 +85,9 @@ print(disability_data['DISABILITY_CATEGORY'])
 disability_counts = disability_data['DISABILITY_CATEGORY'].value_counts()
 print(disability_counts)
 
-# create a chart and save it as a png file
-plt.figure(figsize=(12, 6))
-sns.barplot(x=disability_counts.index, y=disability_counts.values)
-plt.title('Disability Type Counts')
-plt.xlabel('Disability')
-plt.ylabel('Type')
-plt.tight_layout()
-plt.savefig("disability_chart.png")
+# queue a chart, saved as a png file at the end
+figures.append(figure_jobs.job('disability_chart.png', draw_counts_bar,
+                               (disability_counts, 'Disability Type Counts', 'Disability'), figsize=(12, 6)))
 
 # STATUS
 
@@ -111,14 +119,9 @@ print(status_data['STATUS_CATEGORY'])
 status_counts = status_data['STATUS_CATEGORY'].value_counts()
 print(status_counts)
 
-# create a chart and save it as a png file
-plt.figure(figsize=(12, 6))
-sns.barplot(x=status_counts.index, y=status_counts.values)
-plt.title('Status Type Counts')
-plt.xlabel('Status')
-plt.ylabel('Type')
-plt.tight_layout()
-plt.savefig("status_chart.png")
+# queue a chart, saved as a png file at the end
+figures.append(figure_jobs.job('status_chart.png', draw_counts_bar,
+                               (status_counts, 'Status Type Counts', 'Status'), figsize=(12, 6)))
 
 # LOCATION
 
@@ -203,3 +206,7 @@ print(ipe_counts)
 
 # print most common IPE
 print('The most common IPE is {}'.format(str(ipe_counts.idxmax())))
+
+# CHARTS
+
+figure_jobs.run_jobs(figures)
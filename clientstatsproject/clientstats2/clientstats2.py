@@ -1,10 +1,12 @@
-import matplotlib
-import matplotlib.pyplot as plt
+import os
+import sys
+
 import seaborn as sns
 import pandas as pd
 from datetime import datetime, date
 
-matplotlib.use('Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import figure_jobs  # noqa: E402
 
 clientstats = pd.read_csv('clientstats.csv')
 
@@ -112,11 +114,14 @@ clientstats['DOB_CATEGORY'] = clientstats['AGE'].apply(categorize_dob)
 print(clientstats['DOB_CATEGORY'].value_counts())
 
 # display the age ranges in a histogram
-sns.histplot(clientstats['DOB_CATEGORY'])
-plt.title('Age Ranges Histogram')
-plt.xlabel('Age Range')
-plt.ylabel('Frequency')
-plt.savefig('age_range_hist.png')
+def draw_age_hist(ax, categories):
+    sns.histplot(categories, ax=ax)
+    ax.set_title('Age Ranges Histogram')
+    ax.set_xlabel('Age Range')
+    ax.set_ylabel('Frequency')
+
+
+figures = [figure_jobs.job('age_range_hist.png', draw_age_hist, clientstats['DOB_CATEGORY'], tight=False)]
 
 # AGE RANGE IPE GOAL
 
@@ -127,10 +132,13 @@ age_ipe_counts = clientstats.groupby(['DOB_CATEGORY', 'IPE_CATEGORY']).size().un
 print(age_ipe_counts)
 
 # create a heatmap
-plt.figure(figsize=(14,8))
-sns.heatmap(age_ipe_counts)
-plt.title('IPE Age Range Heatmap')
-plt.xlabel('IPE Goal Category')
-plt.ylabel('Age Range')
-plt.tight_layout()
-plt.savefig('age_ipe_heatmap.png')
+def draw_heatmap(ax, counts):
+    sns.heatmap(counts, ax=ax)
+    ax.set_title('IPE Age Range Heatmap')
+    ax.set_xlabel('IPE Goal Category')
+    ax.set_ylabel('Age Range')
+
+
+figures.append(figure_jobs.job('age_ipe_heatmap.png', draw_heatmap, age_ipe_counts, figsize=(14, 8)))
+
+figure_jobs.run_jobs(figures)
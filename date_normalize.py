@@ -0,0 +1,77 @@
+'''Column-at-a-time date normalization shared by the cleaning scripts.
+
+Parsing a sheet cell by cell with scalar pd.to_datetime is the slow part of the
+date cleaners. Here a whole column is handled at once:
+
+1. cells are turned into candidate strings with vectorized string ops
+   (`str.extract` for "find a date inside this text"),
+2. candidates are parsed in bulk against explicit formats, each format only
+   tried on the rows still unparsed,
+3. whatever no format matches is handed back to the caller's original per-cell
+   parser, once per distinct value.
+
+Bulk results are limited to unambiguous formats (four-digit years) and years
+1900-2261. A scalar parse gives the same answer for those, so anything else
+goes to the per-cell parser and the outputs match the per-cell code exactly.
+
+Scripts import this file by adding the repository root to sys.path.
+'''
+import numpy as np
+import pandas as pd
+
+# Tried in order on rows still unparsed. Two-digit years are left to the per-cell parser,
+# whose century rules differ from strptime's.
+FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%Y/%m/%d',
+    '%m/%d/%Y',
+    '%m-%d-%Y',
+    '%d/%m/%Y',
+    '%d-%m-%Y',
+    '%d %b %Y',
+    '%b %d, %Y',
+    '%d %B %Y',
+    '%B %d, %Y',
+    '%Y-%m-%dT%H:%M:%S',
+]
+MIN_BULK_YEAR = 1900
+MAX_BULK_YEAR = 2261  # datetime64[ns] ends in April 2262
+
+
+def as_text(values):
+    '''str(value) for every cell, like the per-cell code does (datetimes become "YYYY-MM-DD HH:MM:SS").'''
+    return pd.Series(values.astype(object).map(str), index=values.index, dtype=object)
+
+
+def parse_bulk(tokens, formats=FORMATS):
+    '''Series of candidate strings -> datetime64 Series, NaT where no bulk format applies.'''
+    tokens = pd.Series(tokens, dtype=object)
+    parsed = pd.Series(pd.NaT, index=tokens.index, dtype='datetime64[ns]')
+    todo = tokens.notna()
+    for fmt in formats:
+        if not todo.any():
+            break
+        attempt = pd.to_datetime(tokens[todo], format=fmt, errors='coerce')
+        attempt = attempt[attempt.notna() & attempt.dt.year.between(MIN_BULK_YEAR, MAX_BULK_YEAR)]
+        parsed[attempt.index] = attempt
+        todo[attempt.index] = False
+    return parsed
+
+
+def map_unique(values, func):
+    '''func(value) for each distinct value only, spread back over the column (values must not be NaN).'''
+    uniques = pd.unique(values)
+    results = {v: func(v) for v in uniques}
+    return pd.Series([results[v] for v in values], index=values.index, dtype=object)
+
+
+def join_issues(index, flags, sep='; '):
+    '''Per-row issue text from [(mask, text), ...], joined with `sep` in list order ('' = no issue).'''
+    issues = pd.Series('', index=index, dtype=object)
+    for mask, text in flags:
+        mask = np.asarray(mask, dtype=bool)
+        text = pd.Series(text, index=index, dtype=object) if not np.isscalar(text) else text
+        joined = np.where(issues == '', text, issues + sep + text)
+        issues = issues.where(~mask, pd.Series(joined, index=index, dtype=object))
+    return issues
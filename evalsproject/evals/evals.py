@@ -1,11 +1,16 @@
-import matplotlib
-import matplotlib.pyplot as plt
+import os
+import sys
+
 import pandas as pd
 from datetime import datetime
 
-matplotlib.use('Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import date_normalize  # noqa: E402
+import figure_jobs  # noqa: E402
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import evals_loader  # noqa: E402
 
-evals_data = pd.read_excel('Evals Datasheet 24.xlsx')
+evals_data = evals_loader.load_evals()
 
 date_cols = ['Referral Date', 'Eval Date', 'Feedback Session Date']
 
@@ -20,8 +25,22 @@ def convert_date_and_flag(date_str):
 
     return parsed_date.strftime('%m/%d/%Y')
 
+def convert_dates_and_flag(values):
+    # Same result as convert_date_and_flag on every cell, but common formats are parsed
+    # for the whole column at once and only the leftovers go through the per-cell parser.
+    date_strs = date_normalize.as_text(values).str.strip().str.upper()
+    not_applicable = date_strs.str.startswith('N/A')
+    parsed = date_normalize.parse_bulk(date_strs.where(~not_applicable))
+
+    converted = 'FLAGGED: ' + date_strs
+    bulk = parsed.notna()
+    converted[bulk] = parsed[bulk].dt.strftime('%m/%d/%Y')
+    leftover = ~bulk & ~not_applicable
+    converted[leftover] = date_normalize.map_unique(date_strs[leftover], convert_date_and_flag)
+    return converted.astype(str)  # str dtype, as .apply(convert_date_and_flag) infers
+
 for col in date_cols:
-    evals_data[col] = evals_data[col].apply(convert_date_and_flag)
+    evals_data[col] = convert_dates_and_flag(evals_data[col])
 
 print(evals_data['Feedback Session Date'].head())
 
@@ -70,20 +89,20 @@ print(report_status_counts)
 print(contractor_paid_status_counts)
 print(referral_source_counts)
 
-plt.figure(figsize=(8,6))
-plt.pie(report_status_counts.values, labels=report_status_counts.index)
-plt.title('Report Status Counts by Value')
-plt.savefig('report_status.png')
+def draw_counts_pie(ax, spec):
+    counts, title = spec
+    ax.pie(counts.values, labels=counts.index)
+    ax.set_title(title)
 
-plt.figure(figsize=(8,6))
-plt.pie(contractor_paid_status_counts.values, labels=contractor_paid_status_counts.index)
-plt.title('Contractor Paid Counts by Value')
-plt.savefig('contractor_paid_status.png')
 
-plt.figure(figsize=(8,6))
-plt.pie(referral_source_counts.values, labels=referral_source_counts.index)
-plt.title('Referral Source Counts by Value')
-plt.savefig('referral_source.png')
+figure_jobs.run_jobs([
+    figure_jobs.job('report_status.png', draw_counts_pie,
+                    (report_status_counts, 'Report Status Counts by Value'), figsize=(8, 6), tight=False),
+    figure_jobs.job('contractor_paid_status.png', draw_counts_pie,
+                    (contractor_paid_status_counts, 'Contractor Paid Counts by Value'), figsize=(8, 6), tight=False),
+    figure_jobs.job('referral_source.png', draw_counts_pie,
+                    (referral_source_counts, 'Referral Source Counts by Value'), figsize=(8, 6), tight=False),
+])
 
 # MISSING/DUPLICATE FIELDS
 
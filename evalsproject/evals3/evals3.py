@@ -1,7 +1,13 @@
+import os
+import sys
+
 import pandas as pd
 from datetime import datetime
 
-evals_data = pd.read_excel('Evals Datasheet 24.xlsx')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import evals_loader  # noqa: E402
+
+evals_data = evals_loader.load_evals()
 
 # FLAGGING DATES
 
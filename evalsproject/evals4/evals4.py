@@ -1,10 +1,14 @@
-import matplotlib
-import matplotlib.pyplot as plt
+import os
+import sys
+
 import pandas as pd
 
-matplotlib.use('Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import figure_jobs  # noqa: E402
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import evals_loader  # noqa: E402
 
-evals_data = pd.read_excel('Evals Datasheet 24.xlsx')
+evals_data = evals_loader.load_evals()
 
 # GETTING MISSING DATA
 
@@ -58,8 +62,14 @@ vr_private_pay_reports = completed_reports[(completed_reports['Referral Source']
 
 print(vr_private_pay_reports['Referral Source'].value_counts())
 
-plt.figure(figsize=(8, 6))
-plt.pie(vr_private_pay_reports['Referral Source'].value_counts(), labels=['VR', 'Private Pay'])
-plt.axis('equal')
-plt.title('VR vs Private Pay completed reports')
-plt.savefig('vr_private_pay_pie_chart.png')
+
+def draw_vr_private_pay_pie(ax, counts):
+    ax.pie(counts, labels=['VR', 'Private Pay'])
+    ax.axis('equal')
+    ax.set_title('VR vs Private Pay completed reports')
+
+
+figure_jobs.run_jobs([
+    figure_jobs.job('vr_private_pay_pie_chart.png', draw_vr_private_pay_pie,
+                    vr_private_pay_reports['Referral Source'].value_counts(), figsize=(8, 6), tight=False),
+])
@@ -1,10 +1,16 @@
+import os
+import sys
+
 import matplotlib
 import matplotlib.pyplot as plt
 import pandas as pd
 
 matplotlib.use('Agg')
 
-evals_data = pd.read_excel('Evals Datasheet 24.xlsx')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import evals_loader  # noqa: E402
+
+evals_data = evals_loader.load_evals()
 
 # GETTING MISSING DATA
 
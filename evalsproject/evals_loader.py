@@ -0,0 +1,146 @@
+'''Shared, cached loader for the evals workbook.
+
+openpyxl parsing is the slow part of every evals script, so the sheet is parsed
+once and kept as a typed Parquet file in `.excel_cache/` next to the workbook.
+The cache is keyed on the workbook's content hash (the hash itself is reused
+while the file's mtime and size are unchanged), so editing or replacing the
+workbook triggers exactly one re-parse.
+
+Columns that mix value types (e.g. 'Eval Date' holds dates and strings like
+'N/A - VR') are stored as one Parquet column per type and recombined on load,
+so scripts get back the same Python objects `pd.read_excel` returns.
+
+Scripts import this file by adding the evalsproject folder to sys.path.
+'''
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EVALS_WORKBOOK = 'Evals Datasheet 24.xlsx'
+CACHE_DIRNAME = '.excel_cache'
+# Python types a mixed object column may hold, in the order they are checked.
+_KINDS = [('bool', bool), ('int', int), ('float', float), ('datetime', datetime), ('str', str)]
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_hash(path, cache_dir):
+    '''Content hash of `path`, recomputed only when its mtime or size changed since last time.'''
+    st = os.stat(path)
+    meta_path = os.path.join(cache_dir, os.path.basename(path) + '.meta.json')
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta['mtime_ns'] == st.st_mtime_ns and meta['size'] == st.st_size:
+            return meta['sha256']
+    except (FileNotFoundError, KeyError, json.JSONDecodeError):
+        pass
+    sha = file_sha256(path)
+    with open(meta_path, 'w') as f:
+        json.dump({'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'sha256': sha}, f)
+    return sha
+
+
+def _kind(value):
+    for name, kind in _KINDS:
+        if isinstance(value, kind):
+            return name
+    return None
+
+
+def _encode(df):
+    '''DataFrame -> (Arrow table, layout), splitting mixed-type object columns by type; None if not storable.'''
+    columns, layout = {}, []
+    for i, name in enumerate(df.columns):
+        if not isinstance(name, str):
+            return None
+        col = df[name]
+        if col.dtype != object:
+            columns[f'c{i}'] = col
+            layout.append([name, None])
+            continue
+        kinds = col.dropna().map(_kind)
+        if kinds.isna().any():
+            return None
+        for kind in kinds.unique():
+            part = col.where(kinds.reindex(col.index) == kind)
+            if kind == 'datetime':
+                # Microsecond precision, like openpyxl, so typos such as year 5024 still fit.
+                part = pd.Series(part.where(part.notna(), None).to_numpy().astype('datetime64[us]'), index=col.index)
+            elif kind != 'str':
+                part = part.astype('float64' if kind != 'bool' else 'boolean')
+            columns[f'c{i}_{kind}'] = part
+        layout.append([name, list(kinds.unique())])
+    return pa.Table.from_pandas(pd.DataFrame(columns, index=df.index), preserve_index=False), layout
+
+
+def _decode(frame, layout):
+    out = {}
+    for i, (name, kinds) in enumerate(layout):
+        if kinds is None:
+            out[name] = frame[f'c{i}']
+            continue
+        col = np.full(len(frame), np.nan, dtype=object)
+        for kind in kinds:
+            part = frame[f'c{i}_{kind}']
+            mask = part.notna().to_numpy()
+            if kind == 'datetime':
+                # .tolist() on datetime64[us] gives datetime.datetime, like openpyxl does.
+                values = part[mask].to_numpy().astype('datetime64[us]').tolist()
+            elif kind == 'int':
+                values = [int(v) for v in part[mask]]
+            elif kind == 'bool':
+                values = [bool(v) for v in part[mask]]
+            else:
+                values = part[mask].tolist()
+            for j, value in zip(np.flatnonzero(mask), values):
+                col[j] = value
+        col = pd.Series(col, index=frame.index, dtype=object)
+        out[name] = col
+    return pd.DataFrame(out)
+
+
+def read_excel_cached(path, sheet_name=0, cache_dir=None):
+    '''pd.read_excel(path, sheet_name) served from the Parquet cache when the workbook is unchanged.'''
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    sha = source_hash(path, cache_dir)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, f'{stem}.{sheet_name}.{sha[:16]}.parquet')
+
+    if os.path.exists(cache_path):
+        table = pq.read_table(cache_path)
+        layout = json.loads(table.schema.metadata[b'evals_loader_layout'])
+        return _decode(table.to_pandas(), layout)
+
+    df = pd.read_excel(path, sheet_name=sheet_name)
+    encoded = _encode(df)
+    if encoded is not None:
+        table, layout = encoded
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                               b'evals_loader_layout': json.dumps(layout).encode()})
+        # Drop caches of older versions of this workbook/sheet, then write-then-rename.
+        for name in os.listdir(cache_dir):
+            if name.startswith(f'{stem}.{sheet_name}.') and name.endswith('.parquet'):
+                os.remove(os.path.join(cache_dir, name))
+        tmp = f'{cache_path}.tmp'
+        pq.write_table(table, tmp)
+        os.replace(tmp, cache_path)
+    return df
+
+
+def load_evals(path=EVALS_WORKBOOK):
+    '''The evals datasheet, as pd.read_excel would return it.'''
+    return read_excel_cached(path)
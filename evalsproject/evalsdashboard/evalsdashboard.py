@@ -1,52 +1,125 @@
+import io
+import os
+import sys
+
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-
-evals_data = pd.read_excel('Evals Datasheet 24.xlsx')
-
-st.header('Report Status metrics')
-st.write('A vast majory of reports have been sent, while roughly 1 in 4 were N/A. There were only 3 payment issues.')
-status_counts = evals_data['Report Status'].value_counts(dropna=False)
-
-st.subheader('Report completion % by category')
-fig, ax = plt.subplots()
-ax.pie(status_counts, labels=status_counts.index, autopct='%1.1f%%')
-ax.axis('equal')
-st.pyplot(fig)
-
-st.subheader('Number of reports by report status')
-st.write(status_counts)
-
-st.header('Report Status based on Referral Source, Eval Type, Month')
-evals_data = evals_data.dropna(subset=['Eval Date'])
-evals_data['Eval Date'] = pd.to_datetime(evals_data['Eval Date'], errors='coerce')
-evals_data['Month'] = evals_data['Eval Date'].dt.to_period('M')
-print(evals_data['Eval Date'])
-
-st.subheader('Referral Source')
-st.write('The three most common referral sources are VR, insurance carrier, and private pay in that order.')
-st.write('The other sources are used infrequently.')
-st.write(evals_data['Referral Source'].value_counts())
-st.bar_chart(evals_data['Referral Source'].value_counts())
-
-st.subheader('Eval Type')
-st.write('Psychological is the most common evaluation type.')
-st.write(evals_data['Eval Type'].value_counts())
-st.bar_chart(evals_data['Eval Type'].value_counts())
-
-st.subheader('Month')
-st.write('The amount of evaluations per month appears to fluctuate on a monthly basis, though fairly steady with the exception of the beginning of 2024 and 2025')
-st.write(evals_data['Month'].astype(str).value_counts())
-st.bar_chart(evals_data['Month'].astype(str).value_counts())
-
-st.header('Investigating payment issues')
-st.write('All 3 payment issues were from Orlando or the Orlando office, were Psychological eval type, and had a referral date within a span of less than 2 months.')
-st.write('2 of the referral sources were private pay, with one being from an insurance carrier.')
-payment_issues = evals_data[evals_data['Report Status'] == 'Payment Issues']
-st.write(payment_issues[['Client Name', 'Referral Date', 'Eval Date', 'Referral Source', 'Eval Type', 'Location']])
-
-st.subheader('Referral Source counts')
-st.bar_chart(payment_issues['Referral Source'].value_counts())
-
-st.subheader('Location counts')
-st.bar_chart(payment_issues['Location'].value_counts())
+from matplotlib.figure import Figure
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import evals_loader  # noqa: E402
+
+WORKBOOK = evals_loader.EVALS_WORKBOOK
+
+
+# CACHED DATA
+# Every cached function takes the workbook's (mtime, size) signature, so editing the
+# workbook gives new cache keys and everything is recomputed once; otherwise reruns and
+# other viewers reuse the cached results instead of re-reading and re-counting.
+
+def workbook_signature(path=WORKBOOK):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+@st.cache_data(max_entries=2)
+def load_data(signature):
+    return evals_loader.load_evals(WORKBOOK)
+
+
+@st.cache_data(max_entries=2)
+def load_dated_data(signature):
+    evals_data = load_data(signature).dropna(subset=['Eval Date']).copy()
+    evals_data['Eval Date'] = pd.to_datetime(evals_data['Eval Date'], errors='coerce')
+    evals_data['Month'] = evals_data['Eval Date'].dt.to_period('M').astype(str)
+    return evals_data
+
+
+@st.cache_data(max_entries=16)
+def counts(signature, column, dated=True, dropna=True):
+    evals_data = load_dated_data(signature) if dated else load_data(signature)
+    return evals_data[column].value_counts(dropna=dropna)
+
+
+@st.cache_data(max_entries=2)
+def payment_issues(signature):
+    evals_data = load_dated_data(signature)
+    return evals_data[evals_data['Report Status'] == 'Payment Issues']
+
+
+@st.cache_data(max_entries=8)
+def payment_issue_counts(signature, column):
+    return payment_issues(signature)[column].value_counts()
+
+
+@st.cache_data(max_entries=2)
+def status_pie_png(signature):
+    status_counts = counts(signature, 'Report Status', dated=False, dropna=False)
+    # A standalone Figure, not pyplot: Streamlit runs sessions on threads and pyplot state is global.
+    fig = Figure()
+    ax = fig.subplots()
+    ax.pie(status_counts, labels=status_counts.index, autopct='%1.1f%%')
+    ax.axis('equal')
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight')
+    return buf.getvalue()
+
+
+# SECTIONS
+# Only the selected section runs. st.tabs would execute the body of every tab on each
+# rerun, so the sections are picked with a radio and drawn on demand.
+
+def report_status_section(signature):
+    st.header('Report Status metrics')
+    st.write('A vast majory of reports have been sent, while roughly 1 in 4 were N/A. There were only 3 payment issues.')
+
+    st.subheader('Report completion % by category')
+    st.image(status_pie_png(signature))
+
+    with st.expander('Number of reports by report status'):
+        st.write(counts(signature, 'Report Status', dated=False, dropna=False))
+
+
+def breakdown_section(signature):
+    st.header('Report Status based on Referral Source, Eval Type, Month')
+    by = st.radio('Break down by', ['Referral Source', 'Eval Type', 'Month'], horizontal=True)
+
+    if by == 'Referral Source':
+        st.subheader('Referral Source')
+        st.write('The three most common referral sources are VR, insurance carrier, and private pay in that order.')
+        st.write('The other sources are used infrequently.')
+    elif by == 'Eval Type':
+        st.subheader('Eval Type')
+        st.write('Psychological is the most common evaluation type.')
+    else:
+        st.subheader('Month')
+        st.write('The amount of evaluations per month appears to fluctuate on a monthly basis, though fairly steady with the exception of the beginning of 2024 and 2025')
+
+    value_counts = counts(signature, by)
+    st.bar_chart(value_counts)
+    with st.expander('Counts'):
+        st.write(value_counts)
+
+
+def payment_issues_section(signature):
+    st.header('Investigating payment issues')
+    st.write('All 3 payment issues were from Orlando or the Orlando office, were Psychological eval type, and had a referral date within a span of less than 2 months.')
+    st.write('2 of the referral sources were private pay, with one being from an insurance carrier.')
+    issues = payment_issues(signature)
+    st.write(issues[['Client Name', 'Referral Date', 'Eval Date', 'Referral Source', 'Eval Type', 'Location']])
+
+    with st.expander('Referral Source counts'):
+        st.bar_chart(payment_issue_counts(signature, 'Referral Source'))
+
+    with st.expander('Location counts'):
+        st.bar_chart(payment_issue_counts(signature, 'Location'))
+
+
+SECTIONS = {
+    'Report Status': report_status_section,
+    'Referral Source, Eval Type, Month': breakdown_section,
+    'Payment issues': payment_issues_section,
+}
+
+section = st.sidebar.radio('Section', list(SECTIONS))
+SECTIONS[section](workbook_signature())
@@ -0,0 +1,70 @@
+'''Shared figure-job runner for the report scripts.
+
+A script describes each chart as a job: the output path, a render function and
+the (already aggregated) data it needs. `run_jobs` renders them on a process
+pool, each into its own object-oriented Figure with the Agg backend, so charts
+never share pyplot's global "current figure" and render in parallel:
+
+    def draw_counts(ax, counts):
+        ax.bar(counts.index, counts.values)
+        ax.set_title('Counts')
+
+    figure_jobs.run_jobs([figure_jobs.job('counts.png', draw_counts, counts, figsize=(8, 6))])
+
+Render functions must be defined at module level (they are sent to the worker
+processes by name). Scripts import this file by adding the repository root to
+sys.path.
+'''
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, NamedTuple
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+from matplotlib.figure import Figure  # noqa: E402
+
+
+class FigureJob(NamedTuple):
+    path: str
+    render: Callable  # render(ax, data); ax.figure is the job's own Figure
+    data: Any = None
+    figsize: tuple = (6.4, 4.8)
+    dpi: float = 100
+    tight: bool = True
+
+
+def job(path, render, data=None, figsize=(6.4, 4.8), dpi=100, tight=True):
+    return FigureJob(path, render, data, figsize, dpi, tight)
+
+
+def render_job(j):
+    '''Draw one job into a fresh Figure and save it; safe to call in any process.'''
+    fig = Figure(figsize=j.figsize, dpi=j.dpi)
+    ax = fig.add_subplot()
+    j.render(ax, j.data)
+    if j.tight:
+        fig.tight_layout()
+    fig.savefig(j.path, dpi=j.dpi)
+    return j.path
+
+
+def _pool_context():
+    # Workers are forked so they inherit the calling script's render functions
+    # without re-running it; where fork isn't available jobs render in-process.
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def run_jobs(jobs, workers=None):
+    '''Render every job, in parallel when there are several; returns the written paths in job order.'''
+    jobs = list(jobs)
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    context = _pool_context()
+    if workers <= 1 or context is None:
+        return [render_job(j) for j in jobs]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return list(pool.map(render_job, jobs))
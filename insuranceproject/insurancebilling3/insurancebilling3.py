@@ -1,8 +1,10 @@
+import os
+import sys
+
 import pandas as pd
-import matplotlib
-import matplotlib.pyplot as plt
 
-matplotlib.use('Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import figure_jobs  # noqa: E402
 
 cleaned_data = pd.read_excel('cleaned_data.xlsx')
 
@@ -35,30 +37,33 @@ print(avg_days_by_service)
 
 # VISUALIZATIONS
 
-plt.figure(figsize=(10, 6))
-plt.barh(
-    avg_days_by_insurance['Insurance Name'],
-    avg_days_by_insurance['Days Between'],
-    color='skyblue'
-)
-plt.xlabel('Average Days Between Service & Feedback')
-plt.ylabel('Insurance Company')
-plt.title('Average Turnaround Time by Insurance Company (Fastest to Slowest)')
-plt.gca().invert_yaxis()
-plt.tight_layout()
-plt.savefig('insurertime.png')
-
-plt.figure(figsize=(8, 5))
-plt.bar(
-    avg_days_by_service['Type Of Services'],
-    avg_days_by_service['Days Between'],
-    color='salmon'
-)
-plt.ylabel('Average Days Between Service & Feedback')
-plt.xlabel('Service Type')
-plt.title('Average Turnaround Time by Service Type')
-plt.tight_layout()
-plt.savefig('servicetime.png')
+def draw_insurer_time(ax, avg_days):
+    ax.barh(
+        avg_days['Insurance Name'],
+        avg_days['Days Between'],
+        color='skyblue'
+    )
+    ax.set_xlabel('Average Days Between Service & Feedback')
+    ax.set_ylabel('Insurance Company')
+    ax.set_title('Average Turnaround Time by Insurance Company (Fastest to Slowest)')
+    ax.invert_yaxis()
+
+
+def draw_service_time(ax, avg_days):
+    ax.bar(
+        avg_days['Type Of Services'],
+        avg_days['Days Between'],
+        color='salmon'
+    )
+    ax.set_ylabel('Average Days Between Service & Feedback')
+    ax.set_xlabel('Service Type')
+    ax.set_title('Average Turnaround Time by Service Type')
+
+
+figure_jobs.run_jobs([
+    figure_jobs.job('insurertime.png', draw_insurer_time, avg_days_by_insurance, figsize=(10, 6)),
+    figure_jobs.job('servicetime.png', draw_service_time, avg_days_by_service, figsize=(8, 5)),
+])
 
 # OUTLIERS
 
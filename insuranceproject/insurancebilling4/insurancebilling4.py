@@ -1,8 +1,10 @@
+import os
+import sys
+
 import pandas as pd
-import matplotlib
-import matplotlib.pyplot as plt
 
-matplotlib.use('Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import figure_jobs  # noqa: E402
 
 cleaned_data = pd.read_excel('cleaned_data.xlsx')
 
@@ -20,25 +22,31 @@ insurance_counts = cleaned_data.groupby(['Primary Language', 'Insurance Name']).
 copay_counts = cleaned_data.groupby(['Primary Language', 'Co-Pay Paid']).size().unstack(fill_value=0)
 service_type_counts = cleaned_data.groupby(['Primary Language', 'Type Of Services']).size().unstack(fill_value=0)
 
-insurance_counts.T.plot(kind='bar', figsize=(8, 5))
-plt.xlabel('Insurance Name')
-plt.ylabel('Number of People')
-plt.title('Insurance Distribution: English vs Non-English Speakers')
-plt.xticks(rotation=90)
-plt.legend(title='Language Group')
-plt.tight_layout()
-plt.savefig('insurance_distribution.png')
-
-copay_counts.T.plot(kind='bar', figsize=(8, 5))
-plt.xlabel('Co-Pay Paid')
-plt.ylabel('Number of People')
-plt.title('Co-Pay Paid Distribution: English vs Non-English Speakers')
-plt.xticks(rotation=90)
-plt.legend(title='Language Group')
-plt.tight_layout()
-plt.savefig('copay_distribution.png')
-
-plt.pie(cleaned_data['Type Of Services'].value_counts(), labels=cleaned_data['Type Of Services'].value_counts().index, autopct='%1.1f%%')
-plt.title('Service Type Pie Chart')
-plt.tight_layout()
-plt.savefig('service_distribution.png')
+service_counts = cleaned_data['Type Of Services'].value_counts()
+
+
+def draw_language_bars(ax, spec):
+    counts, xlabel, title = spec
+    counts.T.plot(kind='bar', ax=ax)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Number of People')
+    ax.set_title(title)
+    ax.tick_params(axis='x', labelrotation=90)
+    ax.legend(title='Language Group')
+
+
+def draw_service_pie(ax, counts):
+    ax.pie(counts, labels=counts.index, autopct='%1.1f%%')
+    ax.set_title('Service Type Pie Chart')
+
+
+# Each chart gets its own figure; the pie used to be drawn onto the co-pay chart's axes.
+figure_jobs.run_jobs([
+    figure_jobs.job('insurance_distribution.png', draw_language_bars,
+                    (insurance_counts, 'Insurance Name', 'Insurance Distribution: English vs Non-English Speakers'),
+                    figsize=(8, 5)),
+    figure_jobs.job('copay_distribution.png', draw_language_bars,
+                    (copay_counts, 'Co-Pay Paid', 'Co-Pay Paid Distribution: English vs Non-English Speakers'),
+                    figsize=(8, 5)),
+    figure_jobs.job('service_distribution.png', draw_service_pie, service_counts, figsize=(8, 5)),
+])
@@ -1,35 +1,98 @@
 # app.py
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field, conlist, field_validator
-import joblib
 import numpy as np
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import metrics
+from batching import MicroBatcher
+from cache import PredictionCache
+from predict import predict_rows
+from registry import load_bundle, registry
 
 logger = logging.getLogger('uvicorn.error')
 
+# Micro-batching of concurrent /predict calls; a max size of 1 disables it.
+BATCH_MAX_SIZE = int(os.getenv('IRIS_BATCH_MAX_SIZE', '32'))
+BATCH_MAX_WAIT_MS = float(os.getenv('IRIS_BATCH_MAX_WAIT_MS', '2'))
+# Upper bound on rows accepted by /predict/batch in a single request.
+BATCH_MAX_ROWS = int(os.getenv('IRIS_BATCH_MAX_ROWS', '1000'))
+# Upper bound on rows accepted by the compact /predict/raw fast path.
+RAW_MAX_ROWS = int(os.getenv('IRIS_RAW_MAX_ROWS', '100000'))
+N_FEATURES = 4
+
+# Cache of /predict responses per (model version, feature vector); size 0 disables it.
+CACHE_SIZE = int(os.getenv('IRIS_CACHE_SIZE', '10000'))
+CACHE_TTL_SECONDS = float(os.getenv('IRIS_CACHE_TTL_SECONDS', '300'))
+# Optional: round features to N decimals before keying, so near-identical vectors share an entry.
+CACHE_ROUND = int(os.environ['IRIS_CACHE_ROUND']) if os.getenv('IRIS_CACHE_ROUND') else None
+
+MODEL_PATH = os.getenv('IRIS_MODEL_PATH', 'model.pkl')
+# Poll MODEL_PATH for changes every N seconds and hot-swap the model; 0 disables the watcher.
+MODEL_WATCH_SECONDS = float(os.getenv('IRIS_MODEL_WATCH_SECONDS', '0'))
+# When set, POST /admin/reload requires a matching X-Admin-Token header.
+ADMIN_TOKEN = os.getenv('IRIS_ADMIN_TOKEN')
+
+# Known-good rows every candidate model must score sensibly before it is swapped in.
+CANARY_ROWS = np.array([
+    [5.1, 3.5, 1.4, 0.2],
+    [6.4, 3.2, 4.5, 1.5],
+    [6.3, 3.3, 6.0, 2.5],
+], dtype=float)
+
 
-class IrisFeatures(BaseModel):
+def check_feature_matrix(x):
+    '''Validate a (rows, 4) float array in one vectorized pass; raises ValueError like the per-row validator.'''
+    if x.ndim != 2 or x.shape[1] != N_FEATURES:
+        raise ValueError(f'features must have length {N_FEATURES}')
+    if not np.isfinite(x).all():
+        raise ValueError('features must be finite numbers')
+    if ((x < 0) | (x > 10)).any():
+        # boundary-case friendly: allow 0..10cm
+        raise ValueError('each feature must be between 0 and 10 centimeters')
+    return x
+
+
+class FeatureRow(BaseModel):
     # Ordered features in cm: [sepal_len, sepal_wid, petal_len, petal_wid]
     features: conlist(float, min_length=4, max_length=4) = Field(
         ..., description='Iris measurements: [sepal_len, sepal_wid, petal_len, petal_wid]'
     )
 
+
+class IrisFeatures(FeatureRow):
     @field_validator('features')
     @classmethod
     def validate_features(cls, v):
         # Ensure finite numbers and reasonable biological range (>=0, <= 10 cm)
-        if len(v) != 4:
-            raise ValueError('features must have length 4')
-        for val in v:
-            if val is None:
+        with metrics.time_stage('validation'):
+            if any(val is None for val in v):
                 raise ValueError('features cannot contain nulls')
-            if not (float('-inf') < float(val) < float('inf')):
-                raise ValueError('features must be finite numbers')
-            if float(val) < 0 or float(val) > 10:
-                # boundary-case friendly: allow 0..10cm
-                raise ValueError('each feature must be between 0 and 10 centimeters')
+            check_feature_matrix(np.array([v], dtype=float))
+        return v
+
+
+class IrisBatch(BaseModel):
+    # Rows are only shape-checked by Pydantic; values are validated below as one array.
+    instances: conlist(FeatureRow, min_length=1, max_length=BATCH_MAX_ROWS) = Field(
+        ..., description='Rows to score in one call, each shaped like a /predict body'
+    )
+
+    @field_validator('instances')
+    @classmethod
+    def validate_instances(cls, v):
+        with metrics.time_stage('validation'):
+            check_feature_matrix(np.array([row.features for row in v], dtype=float))
         return v
 
 
@@ -45,25 +108,181 @@ app.add_middleware(
     allow_headers=['*'],
 )
 
+# Defaults so the routes answer sensibly even before (or without) the startup hooks.
+app.state.pipe = None
+app.state.target_names = None
+app.state.batcher = None
+app.state.model_info = None
+app.state.model_watcher = None
+app.state.cache = PredictionCache(CACHE_SIZE, CACHE_TTL_SECONDS, CACHE_ROUND)
+
+_model_lock = threading.Lock()
+_reload_lock = asyncio.Lock()
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_and_validate(path):
+    '''Load a bundle and check it on the canary rows -> model info dict. Raises on a bad model.'''
+    started = time.perf_counter()
+    bundle = load_bundle(path)
+    pipe, target_names = bundle['pipeline'], bundle['target_names']
+    preds = predict_rows(pipe, target_names, CANARY_ROWS)
+    if len(preds) != len(CANARY_ROWS):
+        raise ValueError('canary check failed: wrong number of predictions')
+    for p in preds:
+        if not 0 <= p['class_index'] < len(target_names):
+            raise ValueError(f"canary check failed: class index {p['class_index']} out of range")
+        probs = p.get('class_probabilities')
+        if probs is not None and not np.isclose(sum(probs), 1.0):
+            raise ValueError('canary check failed: probabilities do not sum to 1')
+    return {
+        'pipe': pipe,
+        'target_names': target_names,
+        'version': _file_sha256(path)[:12],
+        'loaded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'load_seconds': round(time.perf_counter() - started, 4),
+        'fingerprint': registry.fingerprint(path),
+    }
+
+
+def _swap_model(info):
+    '''Install a validated model; readers see either the old or the new one, never a mix.'''
+    with _model_lock:
+        app.state.pipe = info['pipe'] if info else None
+        app.state.target_names = info['target_names'] if info else None
+        app.state.model_info = {k: v for k, v in info.items() if k not in ('pipe', 'target_names')} if info else None
+    # Entries are keyed by version already; clearing just frees memory held for the old model.
+    app.state.cache.clear()
+    if info:
+        metrics.MODEL_LOAD_SECONDS.set(info['load_seconds'])
 
 
 @app.on_event('startup')
 def load_model():
     '''Load model once when the app starts.'''
     try:
-        bundle = joblib.load('model.pkl')
-        app.state.pipe = bundle['pipeline']
-        app.state.target_names = bundle['target_names']
+        _swap_model(_load_and_validate(MODEL_PATH))
         logger.info('Model loaded with classes: %s', list(app.state.target_names))
     except Exception as e:
-        app.state.pipe = None
-        app.state.target_names = None
-        logger.exception('Failed to load model.pkl: %s', e)
+        _swap_model(None)
+        logger.exception('Failed to load %s: %s', MODEL_PATH, e)
+
+
+async def _reload_model():
+    '''Load + validate in a worker thread, then swap. The current model keeps serving meanwhile.'''
+    async with _reload_lock:
+        info = await run_in_threadpool(_load_and_validate, MODEL_PATH)
+        _swap_model(info)
+        logger.info('Model reloaded: version %s in %.3fs', info['version'], info['load_seconds'])
+        return info
+
+
+async def _watch_model():
+    while True:
+        await asyncio.sleep(MODEL_WATCH_SECONDS)
+        try:
+            fp = registry.fingerprint(MODEL_PATH)
+        except OSError:
+            continue  # file mid-replace or removed; keep serving the current model
+        current = app.state.model_info
+        if current is not None and current['fingerprint'] == fp:
+            continue
+        try:
+            await _reload_model()
+        except Exception as e:
+            logger.exception('Model hot-reload failed, keeping current model: %s', e)
+
+
+@app.on_event('startup')
+async def start_model_watcher():
+    if MODEL_WATCH_SECONDS > 0:
+        app.state.model_watcher = asyncio.create_task(_watch_model())
+
+
+@app.on_event('shutdown')
+async def stop_model_watcher():
+    if app.state.model_watcher is not None:
+        app.state.model_watcher.cancel()
+        app.state.model_watcher = None
+
+
+def _record_batch(size, queue_waits):
+    metrics.BATCH_SIZE.observe(size)
+    for w in queue_waits:
+        metrics.BATCH_QUEUE_SECONDS.observe(w)
+
+
+@app.on_event('startup')
+async def start_batcher():
+    if BATCH_MAX_SIZE > 1:
+        app.state.batcher = MicroBatcher(
+            _infer_rows, max_batch_size=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS,
+            on_batch=_record_batch,
+        )
+        await app.state.batcher.start()
+
+
+@app.on_event('shutdown')
+async def stop_batcher():
+    if app.state.batcher is not None:
+        await app.state.batcher.stop()
+        app.state.batcher = None
+
+
+@app.middleware('http')
+async def record_request_metrics(request: Request, call_next):
+    metrics.IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.IN_FLIGHT.dec()
+        # Label by route template, not raw path, to keep label cardinality bounded.
+        route = request.scope.get('route')
+        path = getattr(route, 'path', 'unmatched')
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - start, route=path, method=request.method)
+        metrics.REQUESTS.inc(route=path, method=request.method, status=status)
+
+
+@app.get('/metrics', response_class=PlainTextResponse)
+def prometheus_metrics():
+    '''Prometheus text exposition of request, stage, batching and model-load metrics.'''
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type='text/plain; version=0.0.4')
+
 
-        
 @app.get('/healthz')
 def healthcheck():
-    return {'status': 'ok', 'model_loaded': app.state.pipe is not None}
+    info = app.state.model_info or {}
+    return {
+        'status': 'ok',
+        'model_loaded': app.state.pipe is not None,
+        'model_version': info.get('version'),
+        'model_loaded_at': info.get('loaded_at'),
+        'model_load_seconds': info.get('load_seconds'),
+    }
+
+
+@app.post('/admin/reload')
+async def reload_model(x_admin_token: str | None = Header(default=None)):
+    '''Load the current model file off the request path, validate it, and swap it in.'''
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail='Invalid admin token')
+    try:
+        info = await _reload_model()
+    except Exception as e:
+        logger.exception('Model reload failed, keeping current model: %s', e)
+        raise HTTPException(status_code=409, detail=f'Reload failed, current model kept: {e}')
+    return {'status': 'reloaded', 'model_version': info['version'], 'model_load_seconds': info['load_seconds']}
 
 
 @app.exception_handler(Exception)
@@ -72,26 +291,117 @@ async def unhandled_exceptions(request: Request, exc: Exception):
     return JSONResponse(status_code=500, content={'detail': 'Internal server error'})
 
 
+def _infer_rows(x):
+    '''Run a 2-D feature array through the pipeline -> one response dict per row.'''
+    with _model_lock:
+        pipe, target_names = app.state.pipe, app.state.target_names
+    return predict_rows(pipe, target_names, x)
+
+
 @app.post('/predict')
-def predict(payload: IrisFeatures):
+async def predict(payload: IrisFeatures):
     '''Parse JSON -> run through the *same* preprocessing+model pipeline -> return prediction.'''
     if app.state.pipe is None:
         raise HTTPException(status_code=500, detail='Model not loaded. Ensure model.pkl is present.')
 
+    cache = app.state.cache
+    version = (app.state.model_info or {}).get('version')
+    cached = cache.get(payload.features, version)
+    if cached is not None:
+        metrics.CACHE_HITS.inc()
+        return cached
+    if cache.enabled:
+        metrics.CACHE_MISSES.inc()
+
     try:
-        x = np.array([payload.features], dtype=float)  # type & shape safety
-        y_idx = int(app.state.pipe.predict(x)[0])
-        proba = getattr(app.state.pipe, 'predict_proba', None)
-        resp = {
-            'class_index': y_idx,
-            'class_label': app.state.target_names[y_idx],
-        }
-        if callable(proba):
-            resp['class_probabilities'] = proba(x)[0].tolist()
-        return resp
+        if app.state.batcher is not None and app.state.batcher.running:
+            # Concurrent calls are coalesced into one vectorized pipeline call.
+            resp = await app.state.batcher.submit(payload.features)
+        else:
+            x = np.array([payload.features], dtype=float)  # type & shape safety
+            resp = (await run_in_threadpool(_infer_rows, x))[0]
     except ValueError as ve:
         # e.g., wrong numeric types, NaNs, etc.
         raise HTTPException(status_code=400, detail=f'Invalid input values: {ve}')
     except Exception as e:
         logger.exception('Prediction failed: %s', e)
         raise HTTPException(status_code=500, detail='Prediction failed')
+    # Skip the store if a hot reload landed mid-request; the response may come from either model.
+    if (app.state.model_info or {}).get('version') == version:
+        cache.put(payload.features, version, resp)
+    return resp
+
+
+@app.post('/predict/batch')
+def predict_batch(payload: IrisBatch):
+    '''Score many rows with a single vectorized pipeline call.'''
+    if app.state.pipe is None:
+        raise HTTPException(status_code=500, detail='Model not loaded. Ensure model.pkl is present.')
+
+    try:
+        x = np.array([row.features for row in payload.instances], dtype=float)
+        return {'predictions': _infer_rows(x)}
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=f'Invalid input values: {ve}')
+    except Exception as e:
+        logger.exception('Batch prediction failed: %s', e)
+        raise HTTPException(status_code=500, detail='Prediction failed')
+
+
+def _parse_packed(body):
+    '''Little-endian float32 rows, 4 per row, no framing -> zero-copy (rows, 4) view.'''
+    if len(body) % (4 * N_FEATURES):
+        raise ValueError(f'packed body must be a whole number of {N_FEATURES}-float32 rows')
+    return np.frombuffer(body, dtype='<f4').reshape(-1, N_FEATURES)
+
+
+def _parse_ndjson(body):
+    '''One row per line, either [f1, f2, f3, f4] or {"features": [...]} -> (rows, 4) array.'''
+    lines = [ln for ln in body.split(b'\n') if ln.strip()]
+    try:
+        # Decoded line by line: joining the lines into one JSON array would also accept
+        # several rows on one line, e.g. `[1,2,3,4],[5,6,7,8]`.
+        rows = [json.loads(ln) for ln in lines]
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=422, detail=f'Malformed NDJSON body: {e}')
+    rows = [r['features'] if isinstance(r, dict) and 'features' in r else r for r in rows]
+    try:
+        x = np.array(rows, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError(f'features must be lists of {N_FEATURES} numbers')
+    return x.reshape(0, N_FEATURES) if x.size == 0 else x
+
+
+@app.post('/predict/raw')
+async def predict_raw(request: Request):
+    '''High-volume fast path: packed float32 (application/octet-stream) or NDJSON (application/x-ndjson).
+
+    The whole batch is validated with NumPy at once instead of per-element Pydantic models.
+    Invalid rows get 422, as they would from the Pydantic-validated endpoints.
+    '''
+    if app.state.pipe is None:
+        raise HTTPException(status_code=500, detail='Model not loaded. Ensure model.pkl is present.')
+
+    ctype = request.headers.get('content-type', '').split(';')[0].strip().lower()
+    if ctype not in ('application/octet-stream', 'application/x-ndjson', 'application/ndjson'):
+        raise HTTPException(status_code=415, detail='Use application/octet-stream (packed float32) or application/x-ndjson')
+    body = await request.body()
+    try:
+        x = _parse_packed(body) if ctype == 'application/octet-stream' else _parse_ndjson(body)
+        if x.shape[0] == 0:
+            raise HTTPException(status_code=422, detail='Body contains no rows')
+        if x.shape[0] > RAW_MAX_ROWS:
+            raise HTTPException(status_code=422, detail=f'At most {RAW_MAX_ROWS} rows per request')
+        with metrics.time_stage('validation'):
+            check_feature_matrix(x)
+    except ValueError as ve:
+        raise HTTPException(status_code=422, detail=f'Invalid input values: {ve}')
+    return {'predictions': await run_in_threadpool(_infer_rows, x)}
+
+
+@app.get('/predict/batch/stats')
+def batch_stats():
+    '''Micro-batcher metrics: batch sizes and queue wait of recent /predict calls.'''
+    if app.state.batcher is None:
+        return {'running': False, 'max_batch_size': 1, 'max_wait_ms': 0.0}
+    return app.state.batcher.stats()
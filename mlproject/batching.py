@@ -0,0 +1,125 @@
+# batching.py
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+
+class MicroBatcher:
+    '''Gather concurrent single-row requests and run them through the model as one array.
+
+    A request waits at most `max_wait_ms` for company; a batch is flushed as soon
+    as it reaches `max_batch_size` rows. `infer` receives a 2-D float array and
+    must return one result per row, in order. `on_batch(size, queue_waits_s)`, if
+    given, is called for every batch (e.g. to feed metrics).
+    '''
+
+    def __init__(self, infer, max_batch_size=32, max_wait_ms=2.0, history=1024, on_batch=None):
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be >= 1')
+        if max_wait_ms < 0:
+            raise ValueError('max_wait_ms must be >= 0')
+        self.infer = infer
+        self.on_batch = on_batch
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait_ms = float(max_wait_ms)
+        self.batch_sizes = deque(maxlen=history)
+        self.queue_waits_ms = deque(maxlen=history)
+        self.batches = 0
+        self.rows = 0
+        self._queue = None
+        self._worker = None
+
+    @property
+    def running(self):
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        # Anything still queued will never be served; fail it instead of hanging the caller.
+        while not self._queue.empty():
+            _, _, fut = self._queue.get_nowait()
+            if not fut.done():
+                fut.set_exception(RuntimeError('batcher stopped'))
+
+    async def submit(self, row):
+        '''Queue one feature row and wait for its result.'''
+        if not self.running:
+            raise RuntimeError('batcher is not running')
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, time.perf_counter(), fut))
+        return await fut
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        started = time.perf_counter()
+        self.batches += 1
+        self.rows += len(batch)
+        self.batch_sizes.append(len(batch))
+        waits = [started - queued for _, queued, _ in batch]
+        self.queue_waits_ms.extend(w * 1000.0 for w in waits)
+        if self.on_batch is not None:
+            self.on_batch(len(batch), waits)
+
+        X = np.array([row for row, _, _ in batch], dtype=float)
+        try:
+            # Run the model off the event loop so new requests keep queueing meanwhile.
+            results = await asyncio.get_running_loop().run_in_executor(None, self.infer, X)
+        except Exception as e:
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, _, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+    def stats(self):
+        '''Summary of recent batches: sizes and how long rows sat in the queue.'''
+        sizes = np.array(self.batch_sizes, dtype=float)
+        waits = np.array(self.queue_waits_ms, dtype=float)
+        return {
+            'running': self.running,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_ms,
+            'batches': self.batches,
+            'rows': self.rows,
+            'last_batch_size': int(sizes[-1]) if sizes.size else 0,
+            'mean_batch_size': float(sizes.mean()) if sizes.size else 0.0,
+            'queue_wait_ms': {
+                'p50': float(np.percentile(waits, 50)) if waits.size else 0.0,
+                'p95': float(np.percentile(waits, 95)) if waits.size else 0.0,
+                'max': float(waits.max()) if waits.size else 0.0,
+            },
+        }
@@ -0,0 +1,66 @@
+# cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    '''Bounded LRU + TTL cache of /predict responses, keyed by model version and feature vector.
+
+    With `round_digits` set, features are rounded before keying, so vectors that
+    differ only below that precision share an entry. `maxsize=0` disables the
+    cache; `ttl_seconds=0` means entries never expire on age.
+    '''
+
+    def __init__(self, maxsize=10000, ttl_seconds=300.0, round_digits=None, clock=time.monotonic):
+        self.maxsize = int(maxsize)
+        self.ttl_seconds = float(ttl_seconds)
+        self.round_digits = round_digits
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored_at, response)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def key(self, features, version):
+        if self.round_digits is None:
+            return (version, tuple(float(v) for v in features))
+        return (version, tuple(round(float(v), self.round_digits) for v in features))
+
+    def get(self, features, version):
+        '''Cached response for these features under this model version, or None.'''
+        if not self.enabled:
+            return None
+        key = self.key(features, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds and self.clock() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, features, version, response):
+        if not self.enabled:
+            return
+        key = self.key(features, version)
+        with self._lock:
+            self._entries[key] = (self.clock(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,198 @@
+# forest.py
+import os
+import struct
+import zipfile
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+FORMAT_VERSION = 1
+
+
+class CompiledForest:
+    '''Array-backed RandomForest (+ optional StandardScaler) evaluator.
+
+    All trees live in one set of contiguous node arrays; leaves point to
+    themselves so every row can walk every tree in lock-step with plain NumPy
+    indexing. Mirrors sklearn's own arithmetic (float64 scaling, float32 split
+    comparisons, tree-order probability sums) so outputs are identical to the
+    source pipeline. Exposes `predict`, `predict_proba` and `classes_`, so it
+    drops into `predict.predict_rows` in place of the pickled Pipeline.
+    '''
+
+    def __init__(self, arrays):
+        self.mean = arrays['mean']
+        self.scale = arrays['scale']
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        self.classes_ = arrays['classes']
+        self.max_depth = int(arrays['max_depth'])
+        self.n_features_in_ = int(arrays['n_features'])
+        self.target_names = arrays.get('target_names')
+
+    @classmethod
+    def from_pipeline(cls, pipe, target_names=None):
+        '''Flatten a fitted [StandardScaler ->] RandomForestClassifier into node arrays.'''
+        steps = [est for _, est in pipe.steps] if isinstance(pipe, Pipeline) else [pipe]
+        scaler = None
+        if len(steps) == 2 and isinstance(steps[0], StandardScaler):
+            scaler, steps = steps[0], steps[1:]
+        if len(steps) != 1 or not isinstance(steps[0], RandomForestClassifier):
+            raise ValueError('only [StandardScaler ->] RandomForestClassifier pipelines can be compiled')
+        forest = steps[0]
+        if forest.n_outputs_ != 1:
+            raise ValueError('multi-output forests are not supported')
+
+        n_features = forest.n_features_in_
+        mean = np.zeros(n_features)
+        scale = np.ones(n_features)
+        if scaler is not None:
+            # mean_ is fitted even with with_mean=False, but transform only uses it when with_mean is set.
+            if scaler.with_mean:
+                mean = scaler.mean_.astype(np.float64)
+            if scaler.with_std:
+                scale = scaler.scale_.astype(np.float64)
+
+        feature, threshold, left, right, value, roots = [], [], [], [], [], []
+        offset = 0
+        for est in forest.estimators_:
+            tree = est.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            ids = np.arange(n)
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, ids, tree.children_left) + offset)
+            right.append(np.where(is_leaf, ids, tree.children_right) + offset)
+            # Same per-leaf normalisation DecisionTreeClassifier.predict_proba applies.
+            v = tree.value[:, 0, :].astype(np.float64)
+            norm = v.sum(axis=1, keepdims=True)
+            norm[norm == 0.0] = 1.0
+            value.append(v / norm)
+            offset += n
+
+        return cls({
+            'mean': mean,
+            'scale': scale,
+            'feature': np.concatenate(feature).astype(np.int32),
+            'threshold': np.concatenate(threshold).astype(np.float64),
+            'left': np.concatenate(left).astype(np.int32),
+            'right': np.concatenate(right).astype(np.int32),
+            'value': np.concatenate(value),
+            'roots': np.asarray(roots, dtype=np.int32),
+            'classes': np.asarray(forest.classes_),
+            'max_depth': max(est.tree_.max_depth for est in forest.estimators_),
+            'n_features': n_features,
+            'target_names': None if target_names is None else np.asarray(target_names),
+        })
+
+    def _arrays(self):
+        out = {
+            'format_version': FORMAT_VERSION,
+            'mean': self.mean,
+            'scale': self.scale,
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'left': self.left,
+            'right': self.right,
+            'value': self.value,
+            'roots': self.roots,
+            'classes': self.classes_,
+            'max_depth': self.max_depth,
+            'n_features': self.n_features_in_,
+        }
+        if self.target_names is not None:
+            out['target_names'] = np.asarray(self.target_names, dtype=str)
+        return out
+
+    def save(self, path):
+        # Uncompressed so arrays can be read (or memory-mapped) straight from the file.
+        # Written to a temp file and renamed so processes mapping the old file never see a torn write.
+        tmp = f'{path}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, **self._arrays())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        '''Read a saved forest. With `mmap=True` the node arrays are read-only views of the
+        file, so every process mapping it shares one copy through the OS page cache.'''
+        if mmap:
+            arrays = _memmap_npz(path)
+        else:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {k: data[k] for k in data.files}
+        if int(arrays['format_version']) != FORMAT_VERSION:
+            raise ValueError(f'unsupported compiled model format in {path}')
+        return cls(arrays)
+
+    def _leaves(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f'expected a 2-D array with {self.n_features_in_} features')
+        # sklearn scales in float64, then trees compare float32 inputs against float64 thresholds.
+        Xs = ((X - self.mean) / self.scale).astype(np.float32).astype(np.float64)
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.roots.size)).copy()
+        for _ in range(self.max_depth):
+            go_left = Xs[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict_proba(self, X):
+        node = self._leaves(X)
+        # (trees, rows, classes) summed over axis 0 adds trees in order, like the forest does.
+        proba = self.value[node.T].sum(axis=0)
+        proba /= self.roots.size
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.mean, self.scale, self.feature, self.threshold,
+                                      self.left, self.right, self.value, self.roots))
+
+
+def _memmap_npz(path):
+    '''Map every array of an uncompressed .npz without copying it into private memory.'''
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, 'rb') as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f'{path} is compressed and cannot be memory-mapped')
+            # Local file header: 30 fixed bytes, then file name and extra field, then the .npy payload.
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = struct.unpack('<HH', f.read(4))
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            key = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if shape == ():
+                arrays[key] = np.fromfile(f, dtype=dtype, count=1).reshape(())
+            else:
+                arrays[key] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                        order='F' if fortran_order else 'C')
+    return arrays
+
+
+def compile_bundle(bundle):
+    '''sklearn model bundle -> CompiledForest carrying its target names.'''
+    return CompiledForest.from_pipeline(bundle['pipeline'], bundle.get('target_names'))
+
+
+def load_compiled_bundle(path, mmap=False):
+    '''Read a compiled forest into the same bundle shape joblib bundles use.'''
+    forest = CompiledForest.load(path, mmap=mmap)
+    return {'pipeline': forest, 'target_names': forest.target_names}
@@ -0,0 +1,160 @@
+# metrics.py
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; tuned for a service whose requests take from tens of microseconds to a second or so.
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _fmt_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    esc = (lambda v: str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+    return '{' + ','.join(f'{k}="{esc(v)}"' for k, v in pairs) + '}'
+
+
+def _fmt_value(v):
+    return repr(float(v)) if v != float('inf') else '+Inf'
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[k]) for k in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values = {}
+
+    def inc(self, amount=1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        return [f'{self.name}{_fmt_labels(self.labelnames, k)} {_fmt_value(v)}' for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def dec(self, amount=1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        series = self._series.get(self._key(labels))
+        return series[-1] if series else 0
+
+    def _samples(self):
+        out = []
+        for key, series in sorted(self._series.items()):
+            for bound, n in zip(self.buckets, series):
+                out.append(f'{self.name}_bucket{_fmt_labels(self.labelnames, key, [("le", _fmt_value(bound))])} {n}')
+            out.append(f'{self.name}_bucket{_fmt_labels(self.labelnames, key, [("le", "+Inf")])} {series[-1]}')
+            out.append(f'{self.name}_sum{_fmt_labels(self.labelnames, key)} {_fmt_value(series[-2])}')
+            out.append(f'{self.name}_count{_fmt_labels(self.labelnames, key)} {series[-1]}')
+        return out
+
+
+class MetricsRegistry:
+    '''Minimal Prometheus text-format registry (no external dependency).'''
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for m in self._metrics:
+            lines.extend(m.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.register(Counter(
+    'iris_http_requests_total', 'HTTP requests by route, method and status.', ('route', 'method', 'status')))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'iris_http_request_duration_seconds', 'End-to-end request latency by route.', ('route', 'method')))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    'iris_http_requests_in_flight', 'Requests currently being handled.'))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'iris_stage_duration_seconds',
+    'Time spent per inference stage (validation, predict, predict_proba, serialization).', ('stage',)))
+MODEL_LOAD_SECONDS = REGISTRY.register(Gauge(
+    'iris_model_load_seconds', 'Duration of the most recent model load + validation.'))
+BATCH_SIZE = REGISTRY.register(Histogram(
+    'iris_batch_size_rows', 'Rows per micro-batch sent through the model.',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)))
+BATCH_QUEUE_SECONDS = REGISTRY.register(Histogram(
+    'iris_batch_queue_wait_seconds', 'Time a /predict row waited in the micro-batch queue.'))
+CACHE_HITS = REGISTRY.register(Counter(
+    'iris_prediction_cache_hits_total', '/predict responses served from the prediction cache.'))
+CACHE_MISSES = REGISTRY.register(Counter(
+    'iris_prediction_cache_misses_total', '/predict requests that had to run the model.'))
+
+
+def time_stage(stage):
+    '''Context manager recording one inference stage into STAGE_SECONDS.'''
+    return STAGE_SECONDS.time(stage=stage)
@@ -1,22 +1,187 @@
-import joblib
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import pandas as pd
+
+from metrics import time_stage
+from registry import load_bundle
+
+
+def predict_arrays(pipe, X):
+    '''-> (class indices, probabilities or None) for a 2-D feature array.
+
+    Probabilities are computed once and the class is taken from their argmax,
+    which is exactly what the forest's own `predict` does internally. Estimators
+    without `predict_proba` fall back to plain `predict`.
+    '''
+    proba = getattr(pipe, 'predict_proba', None)
+    if callable(proba):
+        with time_stage('predict_proba'):
+            probs = proba(X)
+            return np.asarray(pipe.classes_).take(probs.argmax(axis=1)), probs
+    with time_stage('predict'):
+        return pipe.predict(X), None
+
+
+def predict_rows(pipe, target_names, X):
+    '''Score a 2-D feature array -> one response dict per row.'''
+    y_idx, probs = predict_arrays(pipe, X)
+    with time_stage('serialization'):
+        out = []
+        for i, idx in enumerate(y_idx):
+            resp = {
+                'class_index': int(idx),
+                'class_label': target_names[int(idx)],
+            }
+            if probs is not None:
+                resp['class_probabilities'] = probs[i].tolist()
+            out.append(resp)
+    return out
 
 
 def predict_one(sample, model_path='model.pkl'):
-    bundle = joblib.load(model_path)
+    bundle = load_bundle(model_path)  # deserialized once per process, reloaded if the file changes
     pipe = bundle['pipeline']
     target_names = bundle['target_names']
-    y_pred = pipe.predict(np.array([sample]))[0]
-    proba = getattr(pipe, 'predict_proba', lambda X: None)(np.array([sample]))
-    out = {
-        'class_index': int(y_pred),
-        'class_label': target_names[y_pred],
-    }
-    if proba is not None:
-        out['class_probabilities'] = proba[0].tolist()
+    return predict_rows(pipe, target_names, np.array([sample]))[0]
+
+
+# ---------- bulk scoring ----------
+
+def _is_parquet(path):
+    return str(path).lower().endswith(('.parquet', '.pq'))
+
+
+def iter_chunks(path, chunksize):
+    '''Stream a CSV or Parquet file as DataFrames of at most `chunksize` rows.'''
+    if _is_parquet(path):
+        import pyarrow.parquet as pq  # optional dependency, only needed for Parquet
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def score_frame(df, model_path, feature_columns, keep_columns=()):
+    '''Score one chunk -> DataFrame of kept columns + class_index, class_label, proba_<label>.'''
+    bundle = load_bundle(model_path)  # cached: one deserialization per (worker) process
+    target_names = np.asarray(bundle['target_names'])
+    X = df[feature_columns].to_numpy(dtype=float)
+    y_idx, probs = predict_arrays(bundle['pipeline'], X)
+    out = df[list(keep_columns)].copy() if keep_columns else pd.DataFrame(index=df.index)
+    out['class_index'] = y_idx.astype(int)
+    out['class_label'] = target_names.take(y_idx.astype(int))
+    if probs is not None:
+        for j, name in enumerate(target_names):
+            out[f'proba_{name}'] = probs[:, j]
     return out
 
 
+class _ChunkWriter:
+    def __init__(self, path):
+        self.path = path
+        self._parquet = None
+        self._first = True
+
+    def write(self, df):
+        if _is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def _resolve_columns(path, model_path, columns):
+    if columns:
+        return list(columns)
+    feature_names = load_bundle(model_path).get('feature_names')
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        header = pq.ParquetFile(path).schema_arrow.names
+    else:
+        header = list(pd.read_csv(path, nrows=0).columns)
+    if feature_names is None:
+        raise ValueError(f'model has no feature names; pass the feature columns explicitly (found: {header})')
+    missing = [c for c in feature_names if c not in header]
+    if missing:
+        raise ValueError(f'input is missing feature columns {missing}; '
+                         f'expected {list(feature_names)}, found {header}')
+    return list(feature_names)
+
+
+def score_file(input_path, output_path, model_path='model.pkl', chunksize=100_000,
+               workers=0, columns=None, keep_columns=()):
+    '''Stream `input_path` through the model chunk by chunk and write predictions to `output_path`.
+
+    Memory stays proportional to `chunksize` (times in-flight chunks when
+    `workers` > 0 fans chunks out over a process pool), not to file size.
+    Output rows keep input order. Returns the number of rows scored.
+    '''
+    feature_columns = _resolve_columns(input_path, model_path, columns)
+    writer = _ChunkWriter(output_path)
+    rows = 0
+    try:
+        if workers and workers > 0:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in iter_chunks(input_path, chunksize):
+                    pending.append(pool.submit(score_frame, chunk, model_path, feature_columns, keep_columns))
+                    # Bound in-flight chunks so a fast reader can't pull the whole file into memory.
+                    if len(pending) >= 2 * workers:
+                        out = pending.popleft().result()
+                        writer.write(out)
+                        rows += len(out)
+                while pending:
+                    out = pending.popleft().result()
+                    writer.write(out)
+                    rows += len(out)
+        else:
+            for chunk in iter_chunks(input_path, chunksize):
+                out = score_frame(chunk, model_path, feature_columns, keep_columns)
+                writer.write(out)
+                rows += len(out)
+    finally:
+        writer.close()
+    return rows
+
+
 if __name__ == '__main__':
-    example = [5.1, 3.5, 1.4, 0.2]
-    print(predict_one(example))
+    parser = argparse.ArgumentParser(
+        description='Score one example row, or bulk-score a CSV/Parquet file of measurements.')
+    parser.add_argument('input', nargs='?', help='CSV or Parquet file of measurement rows')
+    parser.add_argument('output', nargs='?', help='CSV or Parquet file to write predictions to')
+    parser.add_argument('--model', default='model.pkl')
+    parser.add_argument('--chunksize', type=int, default=100_000, help='rows per chunk')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='score chunks in N processes (0 = in this process, -1 = all cores)')
+    parser.add_argument('--columns', nargs=4, help="feature columns (default: the model's feature names)")
+    parser.add_argument('--keep', nargs='*', default=[], help='input columns to copy to the output, e.g. an id')
+    args = parser.parse_args()
+
+    if args.input is None:
+        example = [5.1, 3.5, 1.4, 0.2]
+        print(predict_one(example, args.model))
+    else:
+        if args.output is None:
+            parser.error('output path is required when scoring a file')
+        workers = os.cpu_count() if args.workers == -1 else args.workers
+        try:
+            n = score_file(args.input, args.output, args.model, args.chunksize, workers, args.columns, args.keep)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f'Scored {n} rows -> {args.output}')
@@ -0,0 +1,90 @@
+# registry.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import joblib
+
+from forest import load_compiled_bundle
+
+# Memory-map compiled (.npz) models instead of reading them into private memory.
+MODEL_MMAP = os.getenv('IRIS_MODEL_MMAP', '0') == '1'
+
+
+def load_model_file(path):
+    '''Deserialize a model bundle: compiled forests (.npz) or joblib pickles (anything else).'''
+    if str(path).endswith('.npz'):
+        return load_compiled_bundle(path, mmap=MODEL_MMAP)
+    return joblib.load(path)
+
+
+class ModelRegistry:
+    '''Process-wide cache of loaded model bundles, keyed by file path.
+
+    Each entry remembers the file's fingerprint (mtime + size, plus a SHA-256 of
+    the contents when `use_hash=True`); a changed file is reloaded on the next
+    `get`. At most `maxsize` bundles are kept, least recently used evicted first.
+    '''
+
+    def __init__(self, maxsize=4, use_hash=False, loader=load_model_file):
+        if maxsize < 1:
+            raise ValueError('maxsize must be >= 1')
+        self.maxsize = maxsize
+        self.use_hash = use_hash
+        self.loader = loader
+        self.loads = 0
+        self.hits = 0
+        self._entries = OrderedDict()  # abs path -> (fingerprint, bundle)
+        self._lock = threading.RLock()
+
+    def fingerprint(self, path):
+        st = os.stat(path)
+        fp = (st.st_mtime_ns, st.st_size)
+        if self.use_hash:
+            h = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    h.update(chunk)
+            fp += (h.hexdigest(),)
+        return fp
+
+    def get(self, path):
+        '''Return the bundle stored at `path`, deserializing it only when needed.'''
+        key = os.path.abspath(path)
+        fp = self.fingerprint(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            bundle = self.loader(key)
+            self.loads += 1
+            self._entries[key] = (fp, bundle)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return bundle
+
+    def invalidate(self, path=None):
+        '''Drop one cached bundle, or all of them when `path` is None.'''
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    def __contains__(self, path):
+        return os.path.abspath(path) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+registry = ModelRegistry(maxsize=int(os.getenv('IRIS_MODEL_CACHE_SIZE', '4')))
+
+
+def load_bundle(path='model.pkl'):
+    '''Load a model bundle through the shared process-wide registry.'''
+    return registry.get(path)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: two-pass (predict + predict_proba) vs single-pass inference,
+plus the compiled array-backed forest when it is available.
+Needs a trained model.pkl (python train_model.py), then run:
+    python scripts/bench_inference.py [--model model.pkl] [--compiled model_compiled.npz] [--calls 500]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from forest import load_compiled_bundle  # noqa: E402
+from predict import predict_rows  # noqa: E402
+
+
+def two_pass(pipe, target_names, x):
+    # The original per-call path: the forest runs once for predict and again for predict_proba.
+    y_idx = int(pipe.predict(x)[0])
+    return {
+        'class_index': y_idx,
+        'class_label': target_names[y_idx],
+        'class_probabilities': pipe.predict_proba(x)[0].tolist(),
+    }
+
+
+def single_pass(pipe, target_names, x):
+    return predict_rows(pipe, target_names, x)[0]
+
+
+def time_calls(fn, pipe, target_names, rows):
+    start = time.perf_counter()
+    out = [fn(pipe, target_names, x) for x in rows]
+    return (time.perf_counter() - start) / len(rows) * 1000, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default='model.pkl')
+    parser.add_argument('--compiled', default='model_compiled.npz')
+    parser.add_argument('--calls', type=int, default=500)
+    args = parser.parse_args()
+
+    bundle = joblib.load(args.model)
+    pipe, target_names = bundle['pipeline'], bundle['target_names']
+    rng = np.random.default_rng(0)
+    rows = [rng.uniform(0.1, 7.9, size=(1, 4)) for _ in range(args.calls)]
+
+    # Warm up both paths so import/JIT-ish first-call costs don't skew the numbers.
+    two_pass(pipe, target_names, rows[0])
+    single_pass(pipe, target_names, rows[0])
+
+    old_ms, old_out = time_calls(two_pass, pipe, target_names, rows)
+    new_ms, new_out = time_calls(single_pass, pipe, target_names, rows)
+
+    if old_out != new_out:
+        print('MISMATCH: single-pass responses differ from predict + predict_proba')
+        sys.exit(1)
+    print(f'calls:        {args.calls}')
+    print(f'two-pass:     {old_ms:.3f} ms/call')
+    print(f'single-pass:  {new_ms:.3f} ms/call')
+    print(f'speedup:      {old_ms / new_ms:.2f}x (responses identical)')
+
+    if os.path.exists(args.compiled):
+        start = time.perf_counter()
+        compiled = load_compiled_bundle(args.compiled)
+        load_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        joblib.load(args.model)
+        pickle_ms = (time.perf_counter() - start) * 1000
+        single_pass(compiled['pipeline'], compiled['target_names'], rows[0])
+        fast_ms, fast_out = time_calls(single_pass, compiled['pipeline'], compiled['target_names'], rows)
+        if fast_out != new_out:
+            print('MISMATCH: compiled forest responses differ from the sklearn pipeline')
+            sys.exit(1)
+        print(f'compiled:     {fast_ms:.3f} ms/call ({old_ms / fast_ms:.1f}x vs two-pass, responses identical)')
+        print(f'load time:    {load_ms:.1f} ms compiled vs {pickle_ms:.1f} ms joblib')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,12 +4,24 @@
 Simple smoke test for the Iris API.
 Run the API (e.g., docker run -p 8000:8000 ...), then execute:
     python scripts/smoke_test.py
+
+Load-test mode (latency percentiles, throughput, error rate per endpoint):
+    python scripts/smoke_test.py --load --rps 200 --duration 10 --workers 16 --out results.json
+    python scripts/smoke_test.py --load --inprocess            # run against app.py via TestClient
+    python scripts/smoke_test.py --load --compare baseline.json  # exit 1 on regression
 """
+import argparse
 import json
+import sys
+import threading
+import time
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 BASE = 'http://127.0.0.1:8000'
+PREDICT_BODY = {'features': [5.1, 3.5, 1.4, 0.2]}
 
 def get(url):
     with urllib.request.urlopen(url) as resp:
@@ -54,5 +66,161 @@ def main():
     code, body = post(BASE + '/predict', {'features': [-1.0, 3.5, 1.4, 0.2]})
     print(code, body)
 
+def percentile(sorted_vals, q):
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * q / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (k - lo)
+
+
+def make_sender(base, inprocess):
+    '''-> send(method, path, payload) returning the HTTP status code.'''
+    if inprocess:
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+        from fastapi.testclient import TestClient
+        import app as app_module
+
+        client = TestClient(app_module.app)
+        client.__enter__()  # run startup hooks so the model is loaded
+
+        def send(method, path, payload=None):
+            r = client.get(path) if method == 'GET' else client.post(path, json=payload)
+            return r.status_code
+        return send, lambda: client.__exit__(None, None, None)
+
+    def send(method, path, payload=None):
+        try:
+            if method == 'GET':
+                return get(base + path)[0]
+            return post(base + path, payload)[0]
+        except urllib.error.HTTPError as e:
+            return e.code
+    return send, lambda: None
+
+
+def run_load(send, endpoints, rps, duration, workers):
+    '''Open-loop load: requests are scheduled at a fixed rps regardless of how fast the server answers.
+
+    A dispatcher hands each request to a pool of `workers` senders at its scheduled time, and
+    latency is measured from that scheduled time, so time spent queued behind a slow server
+    counts (no coordinated omission). Nothing new is sent after `duration`; requests still
+    queued then are counted as unsent and as errors.
+    '''
+    samples = {name: [] for name, _, _, _ in endpoints}
+    errors = {name: 0 for name in samples}
+    unsent = {name: 0 for name in samples}
+    lock = threading.Lock()
+    interval = 1.0 / rps
+    t0 = time.perf_counter()
+    deadline = t0 + duration
+
+    def fire(name, method, path, payload, scheduled):
+        if time.perf_counter() >= deadline:
+            with lock:
+                unsent[name] += 1
+            return
+        try:
+            ok = 200 <= send(method, path, payload) < 300
+        except Exception:
+            ok = False
+        elapsed = (time.perf_counter() - scheduled) * 1000
+        with lock:
+            samples[name].append(elapsed)
+            if not ok:
+                errors[name] += 1
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        i = 0
+        while True:
+            scheduled = t0 + i * interval
+            if scheduled >= deadline:
+                break
+            now = time.perf_counter()
+            if scheduled > now:
+                time.sleep(scheduled - now)
+            pool.submit(fire, *endpoints[i % len(endpoints)], scheduled)
+            i += 1
+    wall = time.perf_counter() - t0
+
+    report = {'config': {'rps': rps, 'duration_s': duration, 'workers': workers}, 'endpoints': {}}
+    for name, lat in samples.items():
+        lat.sort()
+        n = len(lat)
+        scheduled = n + unsent[name]
+        report['endpoints'][name] = {
+            'requests': n,
+            'unsent': unsent[name],
+            'throughput_rps': round(n / wall, 2),
+            'error_rate': round((errors[name] + unsent[name]) / scheduled, 4) if scheduled else 0.0,
+            'p50_ms': round(percentile(lat, 50), 3),
+            'p95_ms': round(percentile(lat, 95), 3),
+            'p99_ms': round(percentile(lat, 99), 3),
+        }
+    return report
+
+
+def compare(report, baseline, tolerance):
+    '''-> list of human-readable regressions vs. a stored baseline report.'''
+    problems = []
+    for name, cur in report['endpoints'].items():
+        base = baseline.get('endpoints', {}).get(name)
+        if not base:
+            continue
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if base[key] > 0 and cur[key] > base[key] * (1 + tolerance):
+                problems.append(f'{name} {key}: {cur[key]:.2f} vs baseline {base[key]:.2f}')
+        if cur['throughput_rps'] < base['throughput_rps'] * (1 - tolerance):
+            problems.append(f"{name} throughput: {cur['throughput_rps']:.1f} vs baseline {base['throughput_rps']:.1f} rps")
+        if cur['error_rate'] > base['error_rate'] + 0.01:
+            problems.append(f"{name} error rate: {cur['error_rate']:.2%} vs baseline {base['error_rate']:.2%}")
+    return problems
+
+
+def load_main(args):
+    send, close = make_sender(args.base, args.inprocess)
+    endpoints = [
+        ('/predict', 'POST', '/predict', PREDICT_BODY),
+        ('/healthz', 'GET', '/healthz', None),
+    ]
+    try:
+        report = run_load(send, endpoints, args.rps, args.duration, args.workers)
+    finally:
+        close()
+    report['target'] = 'inprocess' if args.inprocess else args.base
+
+    for name, r in report['endpoints'].items():
+        print(f"{name:10s} n={r['requests']:6d}  {r['throughput_rps']:8.1f} rps  "
+              f"p50={r['p50_ms']:.2f}ms p95={r['p95_ms']:.2f}ms p99={r['p99_ms']:.2f}ms  "
+              f"errors={r['error_rate']:.2%} unsent={r['unsent']}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f'Wrote {args.out}')
+    if args.compare:
+        problems = compare(report, json.loads(Path(args.compare).read_text()), args.tolerance)
+        for p in problems:
+            print('REGRESSION:', p)
+        if problems:
+            sys.exit(1)
+        print('No regressions vs', args.compare)
+
+
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--load', action='store_true', help='run the load test instead of the smoke checks')
+    parser.add_argument('--base', default=BASE, help='server URL (ignored with --inprocess)')
+    parser.add_argument('--inprocess', action='store_true', help='drive app.py in-process via TestClient')
+    parser.add_argument('--rps', type=float, default=100.0, help='target requests per second (all workers)')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds to generate load')
+    parser.add_argument('--workers', type=int, default=8, help='max requests in flight at once')
+    parser.add_argument('--out', help='write the JSON report here')
+    parser.add_argument('--compare', help='baseline JSON report; exit 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed relative slowdown before flagging (default 0.2 = 20%%)')
+    args = parser.parse_args()
+    BASE = args.base
+    if args.load:
+        load_main(args)
+    else:
+        main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Pre-fork server for the Iris API: the model is loaded once in the parent process,
+then N workers are forked and share it copy-on-write instead of each unpickling
+its own copy. Pair it with the compiled model + mmap for the flattest memory:
+    IRIS_MODEL_PATH=model_compiled.npz IRIS_MODEL_MMAP=1 python serve.py --workers 4
+Linux/macOS only (uses os.fork).
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+
+import uvicorn
+
+import app as app_module
+
+logger = logging.getLogger('uvicorn.error')
+
+
+def bind_socket(host, port, backlog=2048):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock, log_level):
+    # Fresh signal handling in the child; uvicorn installs its own for graceful shutdown.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(app_module.app, log_level=log_level)
+    # The startup hook runs again here, but the registry already holds this file's
+    # bundle, so the worker reuses the parent's objects instead of loading again.
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--log-level', default='info')
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper())
+
+    app_module.load_model()
+    if app_module.app.state.pipe is None:
+        raise SystemExit(f'Could not load {app_module.MODEL_PATH}; not starting workers.')
+    # Move everything allocated so far out of the GC's reach: collections in the
+    # workers then never touch (and copy) the pages holding the shared model.
+    gc.collect()
+    gc.freeze()
+
+    sock = bind_socket(args.host, args.port)
+    children = set()
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(sock, args.log_level)
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(args.workers):
+        spawn()
+    logger.info('Serving on %s:%d with %d forked workers (parent pid %d)',
+                args.host, args.port, args.workers, os.getpid())
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            logger.warning('Worker %d exited (status %d); starting a replacement', pid, status)
+            spawn()
+    sock.close()
+
+
+if __name__ == '__main__':
+    main()
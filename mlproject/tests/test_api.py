@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 import importlib
+import pytest
 import sys
 from pathlib import Path
 
@@ -37,3 +38,148 @@ def test_type_error():
 def test_out_of_range():
     r = client.post('/predict', json={'features': [11, 3.5, 1.4, 0.2]})
     assert r.status_code in (400, 422)
+
+@pytest.mark.parametrize('batch_max_size', [32, 1])  # micro-batched and unbatched /predict
+def test_batch_prediction_matches_single(tmp_path, monkeypatch, batch_max_size):
+    import joblib
+    model_path = tmp_path / 'model.pkl'
+    _dump_model(model_path, 5)
+    monkeypatch.setattr(app_module, 'MODEL_PATH', str(model_path))
+    monkeypatch.setattr(app_module, 'BATCH_MAX_SIZE', batch_max_size)
+    # No response cache, so every /predict really goes through inference.
+    monkeypatch.setattr(app.state, 'cache', app_module.PredictionCache(0))
+    pipe = joblib.load(model_path)['pipeline']
+    rows = [[5.1, 3.5, 1.4, 0.2], [6.7, 3.0, 5.2, 2.3], [5.9, 3.0, 4.2, 1.5]]
+    with TestClient(app) as c:
+        assert (app.state.batcher is not None) == (batch_max_size > 1)
+        r = c.post('/predict/batch', json={'instances': [{'features': f} for f in rows]})
+        assert r.status_code == 200
+        preds = r.json()['predictions']
+        assert [p['class_index'] for p in preds] == pipe.predict(rows).tolist()
+        for features, pred in zip(rows, preds):
+            single = c.post('/predict', json={'features': features})
+            assert single.status_code == 200
+            assert single.json() == pred
+
+def test_batch_rejects_bad_row():
+    r = client.post('/predict/batch', json={'instances': [{'features': [5.1, 3.5, 1.4, 0.2]},
+                                                          {'features': [11, 3.5, 1.4, 0.2]}]})
+    assert r.status_code in (400, 422)
+
+def test_micro_batcher_coalesces_concurrent_rows():
+    import asyncio
+    from batching import MicroBatcher
+
+    seen = []
+
+    def infer(x):
+        seen.append(len(x))
+        return [float(row.sum()) for row in x]
+
+    async def run():
+        batcher = MicroBatcher(infer, max_batch_size=8, max_wait_ms=50)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit([i, 0, 0, 0]) for i in range(5))), batcher.stats()
+        finally:
+            await batcher.stop()
+
+    results, stats = asyncio.run(run())
+    assert results == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert seen == [5]
+    assert stats['batches'] == 1 and stats['rows'] == 5
+
+def _dump_model(path, n_estimators):
+    import joblib
+    from sklearn.datasets import load_iris
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    iris = load_iris()
+    pipe = Pipeline(steps=[('scale', StandardScaler()),
+                           ('clf', RandomForestClassifier(n_estimators=n_estimators, random_state=0))])
+    pipe.fit(iris.data, iris.target)
+    joblib.dump({'pipeline': pipe, 'target_names': iris.target_names, 'feature_names': iris.feature_names}, path)
+
+def test_admin_reload_swaps_model_and_keeps_it_on_failure(tmp_path, monkeypatch):
+    model_path = tmp_path / 'model.pkl'
+    _dump_model(model_path, 5)
+    monkeypatch.setattr(app_module, 'MODEL_PATH', str(model_path))
+    with TestClient(app) as c:
+        first = c.get('/healthz').json()
+        assert first['model_loaded'] and first['model_version']
+
+        _dump_model(model_path, 7)
+        r = c.post('/admin/reload')
+        assert r.status_code == 200
+        second = c.get('/healthz').json()
+        assert second['model_version'] == r.json()['model_version'] != first['model_version']
+
+        model_path.write_bytes(b'not a model')
+        assert c.post('/admin/reload').status_code == 409
+        assert c.get('/healthz').json()['model_version'] == second['model_version']
+        assert c.post('/predict', json={'features': [5.1, 3.5, 1.4, 0.2]}).status_code == 200
+
+def test_raw_fast_path_matches_batch(tmp_path, monkeypatch):
+    import numpy as np
+    model_path = tmp_path / 'model.pkl'
+    _dump_model(model_path, 5)
+    monkeypatch.setattr(app_module, 'MODEL_PATH', str(model_path))
+    rows = [[5.1, 3.5, 1.4, 0.2], [6.7, 3.0, 5.2, 2.3]]
+    with TestClient(app) as c:
+        packed = c.post('/predict/raw', content=np.array(rows, dtype='<f4').tobytes(),
+                        headers={'Content-Type': 'application/octet-stream'})
+        ndjson = c.post('/predict/raw', content='[5.1, 3.5, 1.4, 0.2]\n{"features": [6.7, 3.0, 5.2, 2.3]}\n',
+                        headers={'Content-Type': 'application/x-ndjson'})
+        batch = c.post('/predict/batch', json={'instances': [{'features': f} for f in rows]})
+    assert packed.status_code == ndjson.status_code == batch.status_code == 200
+    assert ndjson.json() == batch.json()
+    # float32 rounding can move probabilities slightly, not the predicted class here
+    assert [p['class_index'] for p in packed.json()['predictions']] == \
+        [p['class_index'] for p in batch.json()['predictions']]
+
+def test_raw_fast_path_rejects_bad_values(monkeypatch):
+    import numpy as np
+    monkeypatch.setattr(app.state, 'pipe', object())  # validation runs before the model is touched
+    bad_range = client.post('/predict/raw', content='[11, 3.5, 1.4, 0.2]\n',
+                            headers={'Content-Type': 'application/x-ndjson'})
+    not_finite = client.post('/predict/raw', content=np.array([[np.nan, 1, 1, 1]], dtype='<f4').tobytes(),
+                             headers={'Content-Type': 'application/octet-stream'})
+    torn = client.post('/predict/raw', content=b'\x00' * 10, headers={'Content-Type': 'application/octet-stream'})
+    malformed = client.post('/predict/raw', content='[1, 2,\n', headers={'Content-Type': 'application/x-ndjson'})
+    short = client.post('/predict/raw', content='[5.1, 3.5, 1.4]\n', headers={'Content-Type': 'application/x-ndjson'})
+    ragged = client.post('/predict/raw', content='[5.1, 3.5, 1.4, 0.2]\n[5.1, 3.5]\n',
+                         headers={'Content-Type': 'application/x-ndjson'})
+    assert bad_range.status_code == 422
+    assert not_finite.status_code == 422
+    assert torn.status_code == 422
+    assert malformed.status_code == 422
+    two_per_line = client.post('/predict/raw', content='[5.1, 3.5, 1.4, 0.2],[6.7, 3.0, 5.2, 2.3]\n',
+                               headers={'Content-Type': 'application/x-ndjson'})
+    assert short.status_code == ragged.status_code == two_per_line.status_code == 422
+    assert client.post('/predict', json={'features': [5.1, 3.5, 1.4]}).status_code == 422
+    assert client.post('/predict/batch', json={'instances': [{'features': [5.1, 3.5, 1.4]}]}).status_code == 422
+
+def test_metrics_endpoint_counts_requests():
+    client.get('/healthz')
+    r = client.get('/metrics')
+    assert r.status_code == 200
+    assert r.headers['content-type'].startswith('text/plain')
+    body = r.text
+    assert 'iris_http_requests_total{route="/healthz",method="GET",status="200"}' in body
+    assert 'iris_http_request_duration_seconds_bucket{route="/healthz",method="GET",le="+Inf"}' in body
+    assert 'iris_http_requests_in_flight' in body
+
+def test_prediction_cache_serves_identical_bytes(tmp_path, monkeypatch):
+    model_path = tmp_path / 'model.pkl'
+    _dump_model(model_path, 5)
+    monkeypatch.setattr(app_module, 'MODEL_PATH', str(model_path))
+    with TestClient(app) as c:
+        hits = app_module.metrics.CACHE_HITS.value()
+        body = {'features': [6.1, 2.8, 4.7, 1.2]}
+        first = c.post('/predict', json=body)
+        second = c.post('/predict', json=body)
+        assert first.status_code == 200
+        assert second.content == first.content
+        assert app_module.metrics.CACHE_HITS.value() == hits + 1
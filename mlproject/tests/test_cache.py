@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from cache import PredictionCache  # noqa: E402
+
+
+def test_ttl_lru_and_version_keys():
+    now = [0.0]
+    cache = PredictionCache(maxsize=2, ttl_seconds=10, clock=lambda: now[0])
+    cache.put([1, 2, 3, 4], 'v1', {'class_index': 0})
+    assert cache.get([1.0, 2.0, 3.0, 4.0], 'v1') == {'class_index': 0}
+    assert cache.get([1, 2, 3, 4], 'v2') is None  # new model version never sees old answers
+
+    cache.put([5, 5, 5, 5], 'v1', {'class_index': 1})
+    cache.put([6, 6, 6, 6], 'v1', {'class_index': 2})  # evicts the least recently used entry
+    assert cache.get([1, 2, 3, 4], 'v1') is None
+    now[0] = 11.0
+    assert cache.get([6, 6, 6, 6], 'v1') is None  # expired
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_rounding_and_disabled():
+    cache = PredictionCache(round_digits=1)
+    cache.put([5.12, 3.5, 1.4, 0.2], 'v1', {'class_index': 0})
+    assert cache.get([5.08, 3.5, 1.4, 0.2], 'v1') == {'class_index': 0}
+    off = PredictionCache(maxsize=0)
+    off.put([1, 2, 3, 4], 'v1', {})
+    assert off.get([1, 2, 3, 4], 'v1') is None and len(off) == 0
@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from forest import CompiledForest, compile_bundle  # noqa: E402
+from predict import predict_rows  # noqa: E402
+from registry import ModelRegistry  # noqa: E402
+
+iris = load_iris()
+
+
+def _bundle(scaler=None):
+    pipe = Pipeline(steps=[('scale', scaler or StandardScaler()),
+                           ('clf', RandomForestClassifier(n_estimators=25, random_state=0))])
+    pipe.fit(iris.data, iris.target)
+    return {'pipeline': pipe, 'target_names': iris.target_names}
+
+
+def test_compiled_forest_is_identical_to_pipeline(tmp_path):
+    bundle = _bundle()
+    path = tmp_path / 'model_compiled.npz'
+    compile_bundle(bundle).save(path)
+    compiled = CompiledForest.load(path)
+
+    rng = np.random.default_rng(0)
+    X = np.vstack([iris.data, rng.uniform(0, 10, size=(500, 4))])
+    assert np.array_equal(compiled.predict_proba(X), bundle['pipeline'].predict_proba(X))
+    assert np.array_equal(compiled.predict(X), bundle['pipeline'].predict(X))
+    assert list(compiled.target_names) == list(iris.target_names)
+
+
+def test_compiled_forest_matches_partial_scalers():
+    rng = np.random.default_rng(2)
+    X = np.vstack([iris.data, rng.uniform(0, 10, size=(500, 4))])
+    for scaler in (StandardScaler(with_mean=False), StandardScaler(with_std=False)):
+        pipe = _bundle(scaler)['pipeline']
+        compiled = CompiledForest.from_pipeline(pipe)
+        assert np.array_equal(compiled.predict_proba(X), pipe.predict_proba(X))
+
+
+def test_registry_serves_compiled_bundles(tmp_path):
+    bundle = _bundle()
+    path = tmp_path / 'model_compiled.npz'
+    compile_bundle(bundle).save(path)
+    loaded = ModelRegistry().get(path)
+    sample = np.array([[5.1, 3.5, 1.4, 0.2]])
+    assert (predict_rows(loaded['pipeline'], loaded['target_names'], sample)
+            == predict_rows(bundle['pipeline'], bundle['target_names'], sample))
+
+
+def test_memory_mapped_load_matches_in_memory(tmp_path):
+    path = tmp_path / 'model_compiled.npz'
+    compile_bundle(_bundle()).save(path)
+    in_memory = CompiledForest.load(path)
+    mapped = CompiledForest.load(path, mmap=True)
+    assert isinstance(mapped.value, np.memmap) and not mapped.value.flags.writeable
+    X = np.random.default_rng(1).uniform(0, 10, size=(200, 4))
+    assert np.array_equal(mapped.predict_proba(X), in_memory.predict_proba(X))
+    assert list(mapped.target_names) == list(in_memory.target_names)
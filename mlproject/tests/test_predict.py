@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import LinearSVC
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from predict import predict_rows  # noqa: E402
+
+iris = load_iris()
+
+
+def _fit(clf):
+    return Pipeline(steps=[('scale', StandardScaler()), ('clf', clf)]).fit(iris.data, iris.target)
+
+
+def test_single_pass_matches_predict_and_predict_proba():
+    pipe = _fit(RandomForestClassifier(n_estimators=20, random_state=0))
+    out = predict_rows(pipe, iris.target_names, iris.data)
+    assert [r['class_index'] for r in out] == pipe.predict(iris.data).tolist()
+    assert np.allclose([r['class_probabilities'] for r in out], pipe.predict_proba(iris.data))
+    assert all(r['class_label'] == iris.target_names[r['class_index']] for r in out)
+
+
+def test_falls_back_to_predict_without_probabilities():
+    pipe = _fit(LinearSVC())
+    out = predict_rows(pipe, iris.target_names, iris.data[:3])
+    assert [r['class_index'] for r in out] == pipe.predict(iris.data[:3]).tolist()
+    assert all('class_probabilities' not in r for r in out)
+
+
+def test_score_file_streams_chunks_in_order(tmp_path):
+    import joblib
+    import pandas as pd
+    from predict import score_file
+
+    pipe = _fit(RandomForestClassifier(n_estimators=10, random_state=0))
+    model_path = tmp_path / 'model.pkl'
+    joblib.dump({'pipeline': pipe, 'target_names': iris.target_names, 'feature_names': iris.feature_names},
+                model_path)
+    src = pd.DataFrame(iris.data, columns=iris.feature_names)
+    src.insert(0, 'id', range(len(src)))
+    src.to_csv(tmp_path / 'in.csv', index=False)
+
+    n = score_file(tmp_path / 'in.csv', tmp_path / 'out.csv', model_path, chunksize=40, keep_columns=['id'])
+    out = pd.read_csv(tmp_path / 'out.csv')
+    assert n == len(out) == len(src)
+    assert out['id'].tolist() == src['id'].tolist()
+    assert out['class_index'].tolist() == pipe.predict(iris.data).tolist()
+    assert np.allclose(out[[f'proba_{c}' for c in iris.target_names]], pipe.predict_proba(iris.data))
+
+
+def test_score_file_rejects_unknown_columns(tmp_path):
+    import joblib
+    import pandas as pd
+    import pytest
+    from predict import score_file
+
+    model_path = tmp_path / 'model.pkl'
+    joblib.dump({'pipeline': _fit(RandomForestClassifier(n_estimators=5, random_state=0)),
+                 'target_names': iris.target_names, 'feature_names': iris.feature_names}, model_path)
+    pd.DataFrame(iris.data, columns=['a', 'b', 'c', 'd']).to_csv(tmp_path / 'in.csv', index=False)
+
+    with pytest.raises(ValueError, match='expected .*sepal length.*found'):
+        score_file(tmp_path / 'in.csv', tmp_path / 'out.csv', model_path)
+    assert not (tmp_path / 'out.csv').exists()
@@ -0,0 +1,47 @@
+import os
+import sys
+from pathlib import Path
+
+import joblib
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from registry import ModelRegistry  # noqa: E402
+
+
+def _dump(path, value):
+    joblib.dump({'value': value}, path)
+
+
+def test_loads_once_and_reloads_on_change(tmp_path):
+    path = tmp_path / 'model.pkl'
+    _dump(path, 1)
+    reg = ModelRegistry()
+    assert reg.get(path)['value'] == 1
+    assert reg.get(path) is reg.get(path)
+    assert reg.loads == 1
+
+    _dump(path, 2)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))  # coarse filesystem clocks
+    assert reg.get(path)['value'] == 2
+    assert reg.loads == 2
+
+
+def test_lru_eviction_and_invalidate(tmp_path):
+    paths = [tmp_path / f'm{i}.pkl' for i in range(3)]
+    for i, p in enumerate(paths):
+        _dump(p, i)
+    reg = ModelRegistry(maxsize=2)
+    reg.get(paths[0])
+    reg.get(paths[1])
+    reg.get(paths[0])  # m0 is now most recent, so m1 is evicted next
+    reg.get(paths[2])
+    assert paths[0] in reg and paths[2] in reg and paths[1] not in reg
+
+    reg.invalidate(paths[0])
+    assert paths[0] not in reg
+    reg.invalidate()
+    assert len(reg) == 0
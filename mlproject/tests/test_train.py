@@ -0,0 +1,26 @@
+import json
+import sys
+from pathlib import Path
+
+import joblib
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from train_model import train_and_save  # noqa: E402
+
+
+def test_search_saves_best_bundle_and_report(tmp_path):
+    grid = {'clf__n_estimators': [5, 10], 'clf__max_depth': [2, None]}
+    train_and_save(str(tmp_path / 'model.pkl'), compiled_path=str(tmp_path / 'model_compiled.npz'),
+                   param_grid=grid, cv=3, n_jobs=1, report_path=str(tmp_path / 'report.json'))
+
+    report = json.loads((tmp_path / 'report.json').read_text())
+    assert len(report['candidates']) == 4
+    assert all(c['mean_fit_time_s'] >= 0 and 0 <= c['mean_cv_accuracy'] <= 1 for c in report['candidates'])
+    assert report['best_params'] == report['candidates'][0]['params']
+    assert set(report['inference_latency_single_row']) == {'pipeline_ms', 'compiled_ms'}
+
+    bundle = joblib.load(tmp_path / 'model.pkl')
+    assert bundle['pipeline'].named_steps['clf'].n_estimators == report['best_params']['clf__n_estimators']
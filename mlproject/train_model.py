@@ -1,34 +1,149 @@
+import argparse
+import json
+import os
+import time
+
 import joblib
+import numpy as np
 from sklearn.datasets import load_iris
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV, train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
 
+from forest import compile_bundle
+from predict import predict_rows
+
+# Search space over the forest; keys use Pipeline's step__param naming.
+PARAM_GRID = {
+    'clf__n_estimators': [100, 200, 400],
+    'clf__max_depth': [None, 4, 8],
+    'clf__max_features': ['sqrt', None],
+}
 
-def train_and_save(path: str = 'model.pkl'):
-    X, y = load_iris(return_X_y=True, as_frame=True)
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
 
-    pipe = Pipeline(steps=[
+def build_pipeline():
+    return Pipeline(steps=[
         ('scale', StandardScaler()),
+        # n_jobs stays unset: the search parallelises across candidates, and a
+        # single-threaded forest has the lowest per-request latency when served.
         ('clf', RandomForestClassifier(n_estimators=200, random_state=42))
     ])
-    pipe.fit(X_train, y_train)
+
+
+def run_search(X_train, y_train, search='grid', param_grid=None, n_iter=10, cv=5, n_jobs=-1):
+    '''Cross-validated search over the forest -> (best pipeline, per-candidate results).
+
+    Candidates are fitted in a process pool (joblib/loky) across `n_jobs` cores
+    (-1 = all). `search='none'` fits the default pipeline once.
+    '''
+    if search == 'none':
+        pipe = build_pipeline()
+        start = time.perf_counter()
+        pipe.fit(X_train, y_train)
+        return pipe, [{'params': {}, 'mean_fit_time_s': round(time.perf_counter() - start, 4),
+                       'mean_cv_accuracy': None, 'std_cv_accuracy': None, 'rank': 1}]
+
+    param_grid = param_grid or PARAM_GRID
+    if search == 'grid':
+        searcher = GridSearchCV(build_pipeline(), param_grid, cv=cv, n_jobs=n_jobs, scoring='accuracy')
+    elif search == 'random':
+        searcher = RandomizedSearchCV(build_pipeline(), param_grid, n_iter=n_iter, cv=cv, n_jobs=n_jobs,
+                                      scoring='accuracy', random_state=42)
+    else:
+        raise ValueError(f"search must be 'grid', 'random' or 'none', got {search!r}")
+    searcher.fit(X_train, y_train)
+
+    res = searcher.cv_results_
+    candidates = [
+        {
+            'params': res['params'][i],
+            'mean_fit_time_s': round(float(res['mean_fit_time'][i]), 4),
+            'mean_cv_accuracy': round(float(res['mean_test_score'][i]), 4),
+            'std_cv_accuracy': round(float(res['std_test_score'][i]), 4),
+            'rank': int(res['rank_test_score'][i]),
+        }
+        for i in range(len(res['params']))
+    ]
+    candidates.sort(key=lambda c: c['rank'])
+    return searcher.best_estimator_, candidates
+
+
+def measure_latency_ms(pipe, target_names, X, calls=200):
+    '''Median single-row latency of the serving path (predict_rows) in milliseconds.'''
+    rows = np.asarray(X, dtype=float)
+    predict_rows(pipe, target_names, rows[:1])  # warm-up
+    times = []
+    for i in range(calls):
+        x = rows[i % len(rows)][None, :]
+        start = time.perf_counter()
+        predict_rows(pipe, target_names, x)
+        times.append((time.perf_counter() - start) * 1000)
+    return round(float(np.median(times)), 4)
+
+
+def train_and_save(path: str = 'model.pkl', compiled_path: str | None = 'model_compiled.npz',
+                   search: str = 'grid', param_grid: dict | None = None, n_iter: int = 10,
+                   cv: int = 5, n_jobs: int = -1, report_path: str | None = 'training_report.json'):
+    iris = load_iris(as_frame=True)  # loaded once; names reused for the bundle
+    X, y = iris.data, iris.target
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+
+    start = time.perf_counter()
+    pipe, candidates = run_search(X_train, y_train, search, param_grid, n_iter, cv, n_jobs)
+    search_s = time.perf_counter() - start
+    print(f'Searched {len(candidates)} candidate(s) in {search_s:.1f}s; best: {candidates[0]["params"]}')
 
     acc = accuracy_score(y_test, pipe.predict(X_test))
     print(f'Test accuracy: {acc:.3f}')
 
-    joblib.dump({
+    bundle = {
         'pipeline': pipe,
-        'target_names': load_iris().target_names,
-        'feature_names': load_iris().feature_names,
-    }, path)
+        'target_names': iris.target_names,
+        'feature_names': iris.feature_names,
+    }
+    joblib.dump(bundle, path)
     print(f'Saved model pipeline to {path}')
 
-    
+    latency = {'pipeline_ms': measure_latency_ms(pipe, iris.target_names, X_test)}
+    if compiled_path:
+        # Array-backed copy of the same model: identical outputs, much faster to load and score.
+        compiled = compile_bundle(bundle)
+        compiled.save(compiled_path)
+        print(f'Saved compiled forest to {compiled_path}')
+        latency['compiled_ms'] = measure_latency_ms(compiled, iris.target_names, X_test)
+
+    if report_path:
+        report = {
+            'search': search,
+            'cv_folds': cv if search != 'none' else None,
+            'n_jobs': n_jobs,
+            'cpu_count': os.cpu_count(),
+            'search_seconds': round(search_s, 3),
+            'best_params': candidates[0]['params'],
+            'test_accuracy': round(float(acc), 4),
+            'inference_latency_single_row': latency,
+            'model_path': path,
+            'compiled_path': compiled_path,
+            'candidates': candidates,
+        }
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f'Wrote training report to {report_path}')
+
+
 if __name__ == '__main__':
-    train_and_save()
+    parser = argparse.ArgumentParser(description='Train the Iris model and save model.pkl.')
+    parser.add_argument('--search', choices=['grid', 'random', 'none'], default='grid')
+    parser.add_argument('--n-iter', type=int, default=10, help='candidates sampled by --search random')
+    parser.add_argument('--cv', type=int, default=5, help='cross-validation folds')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='worker processes for the search (-1 = all cores)')
+    parser.add_argument('--out', default='model.pkl')
+    parser.add_argument('--compiled-out', default='model_compiled.npz', help="compiled forest path ('' to skip)")
+    parser.add_argument('--report', default='training_report.json')
+    args = parser.parse_args()
+    train_and_save(args.out, compiled_path=args.compiled_out or None, search=args.search,
+                   n_iter=args.n_iter, cv=args.cv, n_jobs=args.n_jobs, report_path=args.report)
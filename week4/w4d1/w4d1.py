@@ -1,8 +1,15 @@
+import os
+import sys
+
 import pandas as pd
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import date_normalize  # noqa: E402
+
 raw_data = pd.read_excel('Employment_OJT Anon.xlsx')
 
-row_issues = {i: [] for i in raw_data.index}
+# (mask, text) per issue, in the order they are reported; joined per row at the end
+issue_flags = []
 
 for col in raw_data.columns:
     if 'date' in col.lower():
@@ -11,13 +18,8 @@ for col in raw_data.columns:
         
         raw_data[col] = pd.to_datetime(raw_data[col], errors='coerce')
 
-        mask_missing = raw_data[col].isna()
-        for i in raw_data[mask_missing].index:
-            row_issues[i].append(f'{col}: Missing/Invalid')
-
-        mask_dups = raw_data[col].duplicated(keep=False)
-        for i in raw_data[mask_dups].index:
-            row_issues[i].append(f'{col}: Duplicate')
+        issue_flags.append((raw_data[col].isna(), f'{col}: Missing/Invalid'))
+        issue_flags.append((raw_data[col].duplicated(keep=False), f'{col}: Duplicate'))
 
         raw_data[col] = raw_data[col].dt.strftime('%m/%d/%Y')
 
@@ -40,6 +42,6 @@ for col in ['Resume Completed', 'Case Notes Submitted']:
 if 'CLIENT STATUS' in raw_data.columns:
     raw_data['CLIENT STATUS'] = raw_data['CLIENT STATUS'].str.strip().str.title()
 
-raw_data['Issues'] = raw_data.index.map(lambda i: '; '.join(row_issues[i]) if row_issues[i] else '')
+raw_data['Issues'] = date_normalize.join_issues(raw_data.index, issue_flags)
 
 raw_data.to_excel('Week_4_Cleaned.xlsx', index=False)
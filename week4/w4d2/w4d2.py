@@ -1,8 +1,10 @@
+import os
+import sys
+
 import pandas as pd
-import matplotlib
-import matplotlib.pyplot as plt
 
-matplotlib.use('Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import figure_jobs  # noqa: E402
 
 cleaned_data = pd.read_excel('Week_4_Cleaned.xlsx')
 
@@ -31,12 +33,16 @@ print(cleaned_data['PPT Hours Category'])
 print(cleaned_data['PPT Hours Category'].value_counts())
 
 ppt_status_ct = pd.crosstab(cleaned_data['CLIENT STATUS'], cleaned_data['PPT Hours Category'])
-ppt_status_ct.plot(kind='barh', stacked=True)
-plt.ylabel('Number of Clients')
-plt.title('Client Status by PPT Hours Completed')
-plt.legend(title='Client Status')
-plt.tight_layout()
-plt.savefig('ppt_status_stacked_bar.png')
+
+
+def draw_ppt_status(ax, crosstab):
+    crosstab.plot(kind='barh', stacked=True, ax=ax)
+    ax.set_ylabel('Number of Clients')
+    ax.set_title('Client Status by PPT Hours Completed')
+    ax.legend(title='Client Status')
+
+
+figure_jobs.run_jobs([figure_jobs.job('ppt_status_stacked_bar.png', draw_ppt_status, ppt_status_ct)])
 
 
 def find_notes_completed_without_resume(val):
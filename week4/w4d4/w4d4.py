@@ -1,9 +1,11 @@
+import os
+import sys
+
 import pandas as pd
-import matplotlib
-import matplotlib.pyplot as plt
 import re
 
-matplotlib.use('Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import figure_jobs  # noqa: E402
 
 cleaned_data = pd.read_excel('Week_4_Cleaned.xlsx')
 
@@ -44,13 +46,17 @@ resume_by_city = (
 )
 print(resume_by_city)
 
-plt.figure(figsize=(10,6))
-plt.barh(resume_by_city['City'], resume_by_city['Resume Completion Rate (%)'])
-plt.xticks(rotation=45, ha='right')
-plt.ylabel('Resume Completion Rate (%)')
-plt.title('Resume Completion Rates by City')
-plt.tight_layout()
-plt.savefig('resume_completion_rates_chart.png')
+
+def draw_resume_by_city(ax, rates):
+    ax.barh(rates['City'], rates['Resume Completion Rate (%)'])
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_ha('right')
+    ax.set_ylabel('Resume Completion Rate (%)')
+    ax.set_title('Resume Completion Rates by City')
+
+
+figures = [figure_jobs.job('resume_completion_rates_chart.png', draw_resume_by_city, resume_by_city, figsize=(10, 6))]
 
 
 def clean_staff(val: str) -> str:
@@ -100,18 +106,23 @@ staff_counts['Cumulative %'] = (
     staff_counts['Client Count'].cumsum().div(total).mul(100).round(2) if total else 0
 )
 
-fig, ax1 = plt.subplots(figsize=(10,6))
 
-ax1.bar(staff_counts['Staff'], staff_counts['Client Count'], color='skyblue')
-ax1.set_ylabel('Client Count')
-ax1.set_xticklabels(staff_counts['Staff'], rotation=45, ha='right')
+def draw_staff_pareto(ax1, staff_counts):
+    ax1.bar(staff_counts['Staff'], staff_counts['Client Count'], color='skyblue')
+    ax1.set_ylabel('Client Count')
+    ax1.set_xticks(range(len(staff_counts)))
+    ax1.set_xticklabels(staff_counts['Staff'], rotation=45, ha='right')
+
+    ax2 = ax1.twinx()
+    ax2.plot(staff_counts['Staff'], staff_counts['Cumulative %'], color='red', marker='o', linestyle='-')
+    ax2.set_ylabel('Cumulative %')
+
+    ax2.axhline(80, color='green', linestyle='--', linewidth=1)
+
+    ax2.set_title('Pareto Chart of Clients per Staff')
+
 
-ax2 = ax1.twinx()
-ax2.plot(staff_counts['Staff'], staff_counts['Cumulative %'], color='red', marker='o', linestyle='-')
-ax2.set_ylabel('Cumulative %')
+figures.append(figure_jobs.job('clients_staff_pareto_chart.png', draw_staff_pareto, staff_counts, figsize=(10, 6)))
 
-ax2.axhline(80, color='green', linestyle='--', linewidth=1)
+figure_jobs.run_jobs(figures)
 
-plt.title('Pareto Chart of Clients per Staff')
-plt.tight_layout()
-plt.savefig('clients_staff_pareto_chart.png')
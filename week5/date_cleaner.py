@@ -6,8 +6,12 @@ import sys
 from difflib import get_close_matches
 from datetime import datetime
 from zoneinfo import ZoneInfo
+import numpy as np
 import pandas as pd
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import date_normalize  # noqa: E402
+
 # --- SIMPLE SETTINGS ---
 PLACEHOLDERS = {'', 'na', 'n/a', 'n.a.', '-', '–', '—'}
 NAIROBI = ZoneInfo('Africa/Nairobi')
@@ -58,7 +62,9 @@ def parse_cell_to_date(value):
     if not m:
         return None, 'no_date_found'
 
-    token = m.group(1)
+    return parse_token(m.group(1))
+
+def parse_token(token):
     # try parse with dayfirst False then True
     for dayfirst in (False, True):
         try:
@@ -68,6 +74,29 @@ def parse_cell_to_date(value):
             pass
     return None, 'invalid_date'
 
+def parse_column_to_dates(values):
+    # column version of parse_cell_to_date: (dates, issue types), same result for every cell.
+    # date tokens are pulled out with one str.extract, common formats are parsed in bulk, and
+    # only tokens no format matches go through parse_token (once per distinct token)
+    text = date_normalize.as_text(values).str.strip()
+    issues = pd.Series(None, index=values.index, dtype=object)
+    dates = pd.Series(None, index=values.index, dtype=object)
+
+    placeholder = values.isna() | text.str.lower().isin(PLACEHOLDERS)
+    issues[placeholder] = 'placeholder'
+    tokens = text.str.extract(DATE_RE, expand=False).where(~placeholder)
+    issues[~placeholder & tokens.isna()] = 'no_date_found'
+
+    parsed = date_normalize.parse_bulk(tokens)
+    bulk = parsed.notna()
+    dates[bulk] = parsed[bulk].dt.date
+
+    leftover = tokens.notna() & ~bulk
+    results = date_normalize.map_unique(tokens[leftover], parse_token)
+    dates[leftover] = [d for d, _ in results]
+    issues[leftover] = [err for _, err in results]
+    return dates, issues
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--in', dest='in_path', required=True)
@@ -103,25 +132,26 @@ def main():
         if col not in cleaned.columns:
             # if non-strict and still missing, just skip
             continue
-        for i, val in cleaned[col].items():
-            d, err = parse_cell_to_date(val)
-
-            if err is not None:
-                # leave original text in cleaned for idempotency/safety
-                issues_rows.append((i, col, val, err))
-                continue
-
-            # extra checks
-            if args.min_year and d.year < args.min_year:
-                issues_rows.append((i, col, val, 'year_lt_min'))
-                continue
-
-            if d > TODAY_KE:
-                issues_rows.append((i, col, val, 'future_date'))
-                continue
-
-            # normalize valid dates
-            cleaned.at[i, col] = d.strftime('%m/%d/%Y')
+        dates, errors = parse_column_to_dates(cleaned[col])
+
+        # extra checks on the dates that parsed
+        ok = errors.isna()
+        days = pd.Series(dates[ok].to_numpy().astype('datetime64[D]'), index=errors.index[ok])
+        if args.min_year:
+            errors[days.index[days.dt.year < args.min_year]] = 'year_lt_min'
+        future = days.index[days > pd.Timestamp(TODAY_KE)]
+        errors[future] = errors[future].fillna('future_date')
+
+        # leave original text in cleaned for idempotency/safety
+        flagged = errors.index[errors.notna()]
+        issues_rows.extend(zip(flagged, [col] * len(flagged), cleaned.loc[flagged, col], errors[flagged]))
+
+        # normalize valid dates
+        valid = errors.isna()
+        if valid.any():
+            cleaned.loc[valid, col] = date_normalize.map_unique(
+                dates[valid], lambda d: d.strftime('%m/%d/%Y')
+            ).to_numpy()
 
     issues_df = pd.DataFrame(
         issues_rows,
@@ -0,0 +1,116 @@
+'''Chart helpers: downsample long series before plotting, and skip redrawing unchanged charts.
+
+    x, y = chart_render.downsample(dates, prices, 2000)         # LTTB by default
+    chart_render.render_cached('trend.png', draw, data, options)  # draw(path) only if inputs changed
+
+For charts rendered elsewhere (e.g. figure_jobs), check `needs_render(path, key)`
+first and call `mark_rendered(path, key)` afterwards.
+'''
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x, y, n_out):
+    '''Largest-Triangle-Three-Buckets: indices of `n_out` points that keep the visual shape of (x, y).
+
+    First and last points are always kept; every bucket in between contributes the
+    point forming the largest triangle with the previous pick and the next bucket's mean.
+    '''
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Mean of the next bucket (the last point when this is the final bucket).
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        mx, my = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        px, py = x[prev], y[prev]
+        area = np.abs((px - mx) * (y[lo:hi] - py) - (px - x[lo:hi]) * (my - py))
+        prev = lo + int(area.argmax())
+        out[i + 1] = prev
+    return out
+
+
+def minmax_indices(y, n_out):
+    '''Keep the min and max of each of n_out // 2 buckets (in x order): cheap, and never hides a spike.'''
+    n = len(y)
+    buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    y = np.asarray(y, dtype='float64')
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    idx = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            seg = y[lo:hi]
+            idx.extend((lo + int(seg.argmin()), lo + int(seg.argmax())))
+    return np.unique(idx)
+
+
+def downsample(x, y, max_points, method='lttb'):
+    '''(x, y) reduced to about `max_points` points; datetime x is supported. Returns the same types sliced.'''
+    if max_points is None or len(x) <= max_points:
+        return x, y
+    xv = np.asarray(x)
+    if not np.issubdtype(xv.dtype, np.number):
+        xv = pd.DatetimeIndex(x).asi8
+    if method == 'lttb':
+        idx = lttb_indices(xv, y, max_points)
+    elif method == 'minmax':
+        idx = minmax_indices(y, max_points)
+    else:
+        raise ValueError(f'unknown downsampling method: {method}')
+    return _take(x, idx), _take(y, idx)
+
+
+def _take(values, idx):
+    return values.iloc[idx] if isinstance(values, pd.Series) else np.asarray(values)[idx]
+
+
+def data_key(data, options=None):
+    '''Stable hash of chart inputs: DataFrames/Series/arrays by content, options as sorted JSON.'''
+    h = hashlib.sha256()
+    for name in sorted(data):
+        value = data[name]
+        h.update(name.encode())
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+            h.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+        else:
+            h.update(np.ascontiguousarray(value).tobytes())
+    h.update(json.dumps(options or {}, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def needs_render(path, key):
+    '''True unless `path` exists and was last rendered from inputs hashing to `key` (kept in `<path>.key`).'''
+    try:
+        with open(f'{path}.key') as f:
+            return not (os.path.exists(path) and f.read().strip() == key)
+    except FileNotFoundError:
+        return True
+
+
+def mark_rendered(path, key):
+    with open(f'{path}.key', 'w') as f:
+        f.write(key)
+
+
+def render_cached(path, draw, data, options=None):
+    '''Call draw(path) only when the inputs changed since `path` was last written. Returns True if redrawn.'''
+    key = data_key(data, options)
+    if not needs_render(path, key):
+        return False
+    draw(path)
+    mark_rendered(path, key)
+    return True
@@ -1,8 +1,14 @@
 from pycoingecko import CoinGeckoAPI
-from datetime import date, timedelta, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta, datetime, timezone
+import argparse
+import json
+import os
+import threading
+import time
 import pandas as pd
 
-cg = CoinGeckoAPI()
+import price_store
 
 cryptocurrencies = ['bitcoin', 'ethereum']
 vscurrency = 'usd'
@@ -10,30 +16,251 @@ vscurrency = 'usd'
 start_date = str(date.today() - timedelta(days=365))
 end_date   = str(date.today())
 
+# CoinGecko returns hourly points for ranges of 1-90 days, so windows stay above that to keep daily data.
+WINDOW_DAYS = 365
+MIN_WINDOW_DAYS = 91
+# The public API allows roughly 30 calls per minute; stay at that by default.
+CALLS_PER_MINUTE = 30
 
-def get_historical_crypto_price_data(cryptocurrency, vscurrency, start_date, end_date):
-    # Convert to UNIX timestamps (seconds since epoch)
-    from_timestamp = int(datetime.strptime(start_date, '%Y-%m-%d').timestamp())
-    to_timestamp   = int(datetime.strptime(end_date, '%Y-%m-%d').timestamp())
 
-    data = cg.get_coin_market_chart_range_by_id(
+class RateLimiter:
+    '''Thread-safe limiter: at most `calls_per_minute` calls, evenly spaced.'''
+
+    def __init__(self, calls_per_minute):
+        self.interval = 60.0 / calls_per_minute if calls_per_minute else 0.0
+        self.next_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.next_at)
+            self.next_at = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
+def to_timestamp(day):
+    # Dates are UTC days, matching the UTC dates written to the CSVs.
+    return int(datetime.strptime(day, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+
+
+def split_windows(start_date, end_date, window_days=WINDOW_DAYS):
+    '''Split [start_date, end_date] into consecutive (from_ts, to_ts) windows of at most window_days.'''
+    window_days = max(window_days, MIN_WINDOW_DAYS)
+    start = datetime.strptime(start_date, '%Y-%m-%d').date()
+    end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    windows = []
+    while start < end:
+        stop = min(start + timedelta(days=window_days), end)
+        windows.append((to_timestamp(str(start)), to_timestamp(str(stop))))
+        start = stop
+    return windows
+
+
+def prices_to_frame(prices):
+    '''CoinGecko [[ms, price], ...] -> one row per UTC date (first point of each day), sorted.'''
+    df = pd.DataFrame({
+        'date': pd.to_datetime([p[0] for p in prices], unit='ms').date,
+        'price': [p[1] for p in prices]
+    })
+    return df.drop_duplicates('date', keep='first').sort_values('date').reset_index(drop=True)
+
+
+def get_historical_crypto_price_data(cryptocurrency, vscurrency, start_date, end_date, client=None):
+    client = client or CoinGeckoAPI()
+    data = client.get_coin_market_chart_range_by_id(
         id=cryptocurrency,
         vs_currency=vscurrency,
-        from_timestamp=from_timestamp,
-        to_timestamp=to_timestamp
+        from_timestamp=to_timestamp(start_date),
+        to_timestamp=to_timestamp(end_date)
     )
+    return prices_to_frame(data['prices'])
 
-    df = pd.DataFrame({
-        'date': pd.to_datetime([p[0] for p in data['prices']], unit='ms').date,
-        'price': [p[1] for p in data['prices']]
-    })
 
-    return df
+def fetch_window(client, cryptocurrency, vscurrency, window, limiter, retries=4):
+    from_ts, to_ts = window
+    for attempt in range(retries + 1):
+        limiter.wait()
+        try:
+            data = client.get_coin_market_chart_range_by_id(
+                id=cryptocurrency, vs_currency=vscurrency, from_timestamp=from_ts, to_timestamp=to_ts
+            )
+            return data['prices']
+        except Exception as e:
+            # 429s and transient errors surface as exceptions from pycoingecko; back off and retry.
+            if attempt == retries:
+                raise RuntimeError(f'{cryptocurrency} {window}: {e}') from e
+            time.sleep(min(60, 2 ** attempt))
 
 
-for cryptocurrency in cryptocurrencies:
-    historical_price_data = get_historical_crypto_price_data(
-        cryptocurrency, vscurrency, start_date, end_date
-    )
+class DownloadError(RuntimeError):
+    '''Some coins could not be downloaded; `failed` maps them to their errors, `frames` holds the rest.'''
+
+    def __init__(self, failed, frames):
+        super().__init__('failed to download: ' + ', '.join(f'{coin} ({err})' for coin, err in failed.items()))
+        self.failed = failed
+        self.frames = frames
+
+
+def download_ranges(ranges, vscurrency, client=None, window_days=WINDOW_DAYS,
+                    max_workers=8, calls_per_minute=CALLS_PER_MINUTE, failures=None):
+    '''Fetch {coin: (start_date, end_date)} concurrently, coin x window, and stitch each coin in order.
+
+    `client` only needs `get_coin_market_chart_range_by_id`, so a fake can stand in for CoinGecko.
+    A coin with a failing window (bad id, retries exhausted) is dropped without
+    affecting the others. Its error is recorded in the `failures` dict when one is
+    passed; otherwise DownloadError is raised once every coin has finished.
+    Returns {coin: DataFrame[date, price]} for the coins that succeeded.
+    '''
+    client = client or CoinGeckoAPI()
+    limiter = RateLimiter(calls_per_minute)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            coin: [pool.submit(fetch_window, client, coin, vscurrency, w, limiter)
+                   for w in split_windows(start, end, window_days)]
+            for coin, (start, end) in ranges.items()
+        }
+        frames, failed = {}, {}
+        for coin, coin_futures in futures.items():
+            try:
+                # Window boundaries overlap by one point; prices_to_frame drops the repeated dates.
+                frames[coin] = prices_to_frame([p for f in coin_futures for p in f.result()])
+            except Exception as e:
+                failed[coin] = e
+    if failures is not None:
+        failures.update(failed)
+    elif failed:
+        raise DownloadError(failed, frames)
+    return frames
+
+
+def download_histories(coins, vscurrency, start_date, end_date, **kwargs):
+    '''Same range for every coin; see download_ranges.'''
+    return download_ranges({coin: (start_date, end_date) for coin in coins}, vscurrency, **kwargs)
+
+
+# ---------- incremental updates ----------
+
+def watermark_path(cryptocurrency, directory='.'):
+    return os.path.join(directory, f'{cryptocurrency}.watermark.json')
+
+
+def csv_last_date(cryptocurrency, directory='.'):
+    '''Last date actually in <coin>.csv, or None when there is no CSV or it is empty.'''
+    csv_path = os.path.join(directory, f'{cryptocurrency}.csv')
+    if not os.path.exists(csv_path):
+        return None
+    dates = pd.read_csv(csv_path, usecols=['date'])['date']
+    return str(dates.max()) if len(dates) else None
+
+
+def read_watermark(cryptocurrency, directory='.'):
+    '''Last stored date for a coin: from its watermark file, else the tail of its CSV, else None.'''
+    try:
+        with open(watermark_path(cryptocurrency, directory)) as f:
+            return json.load(f)['last_date']
+    except (FileNotFoundError, KeyError, json.JSONDecodeError):
+        pass
+    return csv_last_date(cryptocurrency, directory)
+
+
+def write_watermark(cryptocurrency, last_date, rows_added, directory='.'):
+    with open(watermark_path(cryptocurrency, directory), 'w') as f:
+        json.dump({'last_date': str(last_date), 'rows_added': rows_added,
+                   'updated_at': datetime.now(timezone.utc).isoformat(timespec='seconds')}, f)
+
+
+def update_incremental(coins, vscurrency, start_date, end_date, directory='.', store=None, **kwargs):
+    '''Fetch only what each <coin>.csv is missing and append it, de-duplicated on date.
+
+    Coins without stored data get the full [start_date, end_date] range. Existing
+    rows are never rewritten; only dates after both the watermark and the CSV's own
+    last date are appended, so a stale watermark cannot duplicate rows. New rows
+    also go into the Parquet store under `store`, if given; a coin not in the store
+    yet gets its whole CSV there.
+    Returns {coin: rows appended}.
+    '''
+    ranges, last = {}, {}
+    for coin in coins:
+        csv_last = csv_last_date(coin, directory)
+        # Without a CSV there is nothing to append to, whatever the watermark says.
+        last[coin] = max(read_watermark(coin, directory), csv_last) if csv_last is not None else None
+        # Re-request from the last stored day itself so the new range lines up with it; that day is dropped below.
+        begin = last[coin] or start_date
+        if begin < end_date:
+            ranges[coin] = (begin, end_date)
+
+    added = {coin: 0 for coin in coins}
+    for coin, df in download_ranges(ranges, vscurrency, **kwargs).items():
+        if last[coin] is not None:
+            df = df[df['date'].astype(str) > last[coin]]
+        if df.empty:
+            continue
+        csv_path = os.path.join(directory, f'{coin}.csv')
+        fresh = last[coin] is None
+        df.to_csv(csv_path, mode='w' if fresh else 'a', header=fresh, index=False)
+        if store:
+            if os.path.exists(price_store.partition_path(coin, store)):
+                price_store.append_series(coin, df, store)
+            else:
+                # load_series prefers the store, so seed it with the full history, not just the new rows.
+                price_store.write_series(coin, pd.read_csv(csv_path), store)
+        write_watermark(coin, df['date'].max(), len(df), directory)
+        added[coin] = len(df)
+    return added
+
+
+def download_full(coins, vscurrency, start_date, end_date, directory='.', store=None, **kwargs):
+    '''Download [start_date, end_date] for every coin and replace <coin>.csv (and its store partition).
+
+    The watermark is reset to the new CSV's last date, so a later incremental run
+    appends right after it. Returns {coin: rows written}.
+    '''
+    written = {}
+    for coin, df in download_histories(coins, vscurrency, start_date, end_date, **kwargs).items():
+        df.to_csv(os.path.join(directory, f'{coin}.csv'), index=False)
+        if store:
+            price_store.write_series(coin, df, store)
+        if df.empty:
+            # Nothing stored, so an old watermark would only point past the (empty) CSV.
+            if os.path.exists(watermark_path(coin, directory)):
+                os.remove(watermark_path(coin, directory))
+        else:
+            write_watermark(coin, df['date'].max(), len(df), directory)
+        written[coin] = len(df)
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Download daily price history from CoinGecko to <coin>.csv.')
+    parser.add_argument('--coins', nargs='+', default=cryptocurrencies)
+    parser.add_argument('--vs', default=vscurrency)
+    parser.add_argument('--start', default=start_date, help='YYYY-MM-DD')
+    parser.add_argument('--end', default=end_date, help='YYYY-MM-DD')
+    parser.add_argument('--window-days', type=int, default=WINDOW_DAYS,
+                        help=f'days per request (min {MIN_WINDOW_DAYS} to keep daily granularity)')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--calls-per-minute', type=float, default=CALLS_PER_MINUTE)
+    parser.add_argument('--incremental', action='store_true',
+                        help='only fetch days missing from each <coin>.csv and append them')
+    parser.add_argument('--store', default=price_store.STORE_DIR,
+                        help='Parquet store to write alongside the CSVs ("" to skip)')
+    args = parser.parse_args()
+    # Coins that fail are reported at the end instead of aborting the others.
+    failures = {}
+    options = dict(window_days=args.window_days, max_workers=args.workers, calls_per_minute=args.calls_per_minute,
+                   failures=failures)
 
-    historical_price_data.to_csv(f'{cryptocurrency}.csv', index=False)
+    if args.incremental:
+        added = update_incremental(args.coins, args.vs, args.start, args.end, store=args.store, **options)
+        for cryptocurrency, n in added.items():
+            print(f'{cryptocurrency}: +{n} rows')
+    else:
+        written = download_full(args.coins, args.vs, args.start, args.end, store=args.store, **options)
+        for cryptocurrency, n in written.items():
+            print(f'{cryptocurrency}: {n} rows')
+    for cryptocurrency, error in failures.items():
+        print(f'{cryptocurrency}: FAILED, {error}')
+    if failures:
+        raise SystemExit(1)
@@ -1,8 +1,12 @@
 import pandas as pd
 
-# load bitcoin and ethereum data
-bitcoin_df = pd.read_csv('bitcoin.csv')
-ethereum_df = pd.read_csv('ethereum.csv')
+import crypto_engine
+import price_store
+
+# load bitcoin and ethereum data: typed columns from the Parquet store written by
+# crypto.py, or bitcoin.csv / ethereum.csv when the store is missing
+bitcoin_df = price_store.load_series('bitcoin', csv_path='bitcoin.csv')
+ethereum_df = price_store.load_series('ethereum', csv_path='ethereum.csv')
 
 # DATA CLEANING
 
@@ -10,10 +14,7 @@ ethereum_df = pd.read_csv('ethereum.csv')
 bitcoin_cleaned = bitcoin_df.dropna()
 ethereum_cleaned = ethereum_df.dropna()
 
-# ensure sorted by date
-bitcoin_cleaned['date'] = pd.to_datetime(bitcoin_cleaned['date'])
-ethereum_cleaned['date'] = pd.to_datetime(ethereum_cleaned['date'])
-
+# ensure sorted by date (dates are already datetime64, no parsing needed)
 bitcoin_cleaned = bitcoin_cleaned.sort_values(by='date')
 ethereum_cleaned = ethereum_cleaned.sort_values(by='date')
 
@@ -35,16 +36,14 @@ def print_metrics(df):
 print_metrics(bitcoin_cleaned)
 print_metrics(ethereum_cleaned)
 
-# analyze relationship
-price_df = pd.DataFrame({
-    'bitcoin_price': bitcoin_cleaned['price'],
-    'ethereum_price': ethereum_cleaned['price']
-})
+# analyze relationship: align on date (not row position) and summarize with the engine
+price_df = crypto_engine.wide_prices({'bitcoin': bitcoin_cleaned, 'ethereum': ethereum_cleaned})
+returns = crypto_engine.returns(price_df).dropna()
 
-print('Returns:')
-returns = price_df.pct_change().dropna()
-print(returns)
+print('Summary:')
+with pd.option_context('display.width', 160, 'display.float_format', '{:,.4f}'.format):
+    print(crypto_engine.summary(price_df).T)
 
 print('Correlation:')
-correlation = returns.corr()
+correlation = crypto_engine.correlation_matrix(returns)
 print(correlation)
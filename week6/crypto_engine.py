@@ -0,0 +1,97 @@
+'''Multi-asset analytics over a date-aligned price matrix.
+
+Everything works on a wide DataFrame (index: date, one column per coin), so
+each metric is a single vectorized pandas/NumPy operation across all coins
+instead of a loop per coin:
+
+    prices = crypto_engine.load_wide(['bitcoin', 'ethereum', 'solana'])
+    print(crypto_engine.summary(prices))
+'''
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import price_store
+
+WINDOW = 30
+PERIODS_PER_YEAR = 365  # crypto trades every day
+
+
+def wide_prices(frames):
+    '''{coin: DataFrame[date, price]} -> price matrix aligned on date (NaN where a coin has no price).'''
+    series = {}
+    for coin, df in frames.items():
+        s = pd.Series(df['price'].to_numpy(dtype='float64'), index=pd.to_datetime(df['date']))
+        series[coin] = s[~s.index.duplicated(keep='last')]
+    return pd.DataFrame(series).sort_index()
+
+
+def load_wide(coins=None, root=price_store.STORE_DIR, memory_map=True):
+    '''Price matrix for `coins` (all stored coins by default) straight from the Parquet store.'''
+    long = price_store.read_prices(coins, root, memory_map)
+    wide = long.pivot_table(index='date', columns='coin', values='price', aggfunc='last')
+    wide.columns.name = None
+    return wide.reindex(columns=list(coins)) if coins else wide
+
+
+def returns(prices):
+    # fill_method=None: a gap in one coin's history stays a gap instead of a fake 0% day.
+    return prices.pct_change(fill_method=None)
+
+
+def rolling_volatility(rets, window=WINDOW, periods_per_year=PERIODS_PER_YEAR):
+    '''Annualized rolling standard deviation of returns, per coin.'''
+    return rets.rolling(window, min_periods=window // 2).std() * np.sqrt(periods_per_year)
+
+
+def rolling_correlation(rets, benchmark, window=WINDOW):
+    '''Rolling correlation of every coin's returns with the `benchmark` column.'''
+    return rets.rolling(window, min_periods=window // 2).corr(rets[benchmark])
+
+
+def correlation_matrix(rets, window=None):
+    '''Pairwise return correlation, over the last `window` rows or the whole history.'''
+    return (rets.iloc[-window:] if window else rets).corr()
+
+
+def drawdowns(prices):
+    '''Fraction below the running peak, per coin (0 at a new high, -0.5 = half off the top).'''
+    return prices / prices.cummax() - 1
+
+
+def summary(prices, window=WINDOW, benchmark=None):
+    '''One row per coin: range, total return, volatility (overall and latest rolling), drawdowns, correlation.'''
+    rets = returns(prices)
+    dd = drawdowns(prices)
+    valid = prices.notna()
+    first = prices.bfill().iloc[0]
+    last = prices.ffill().iloc[-1]
+    out = pd.DataFrame({
+        'start': valid.idxmax(),
+        'end': valid[::-1].idxmax(),
+        'days': valid.sum(),
+        'last_price': last,
+        'total_return': last / first - 1,
+        'ann_vol': rets.std() * np.sqrt(PERIODS_PER_YEAR),
+        f'vol_{window}d': rolling_volatility(rets, window).ffill().iloc[-1],
+        'max_drawdown': dd.min(),
+        'drawdown_now': dd.ffill().iloc[-1],
+    })
+    benchmark = benchmark or prices.columns[0]
+    out[f'corr_{benchmark}_{window}d'] = rolling_correlation(rets, benchmark, window).ffill().iloc[-1]
+    out.index.name = 'coin'
+    return out
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Summarize returns, volatility, drawdowns and correlation.')
+    parser.add_argument('--coins', nargs='*', help='coins in the Parquet store (default: all)')
+    parser.add_argument('--window', type=int, default=WINDOW, help='rolling window in days')
+    parser.add_argument('--benchmark', help='coin to correlate against (default: first coin)')
+    parser.add_argument('--store', default=price_store.STORE_DIR)
+    args = parser.parse_args()
+
+    prices = load_wide(args.coins, args.store)
+    with pd.option_context('display.width', 160, 'display.max_columns', 20, 'display.float_format', '{:,.4f}'.format):
+        print(summary(prices, args.window, args.benchmark))
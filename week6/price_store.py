@@ -0,0 +1,81 @@
+'''Columnar storage for the crypto price series.
+
+One Parquet file per coin under a hive-style partition, with typed columns
+(date: timestamp, price: float64), so readers skip CSV parsing and
+pd.to_datetime entirely:
+
+    prices/
+        coin=bitcoin/data.parquet
+        coin=ethereum/data.parquet
+'''
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+STORE_DIR = os.getenv('CRYPTO_STORE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prices'))
+SCHEMA = pa.schema([('date', pa.timestamp('ns')), ('price', pa.float64())])
+
+
+def partition_path(coin, root=STORE_DIR):
+    return os.path.join(root, f'coin={coin}', 'data.parquet')
+
+
+def stored_coins(root=STORE_DIR):
+    if not os.path.isdir(root):
+        return []
+    return sorted(name.split('=', 1)[1] for name in os.listdir(root)
+                  if name.startswith('coin=') and os.path.exists(os.path.join(root, name, 'data.parquet')))
+
+
+def to_table(df):
+    '''DataFrame[date, price] -> typed Arrow table, one row per date, sorted.'''
+    df = pd.DataFrame({'date': pd.to_datetime(df['date']), 'price': df['price'].astype('float64')})
+    df = df.dropna().drop_duplicates('date', keep='last').sort_values('date')
+    return pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+
+
+def write_series(coin, df, root=STORE_DIR):
+    '''Replace a coin's partition with `df` (written to a temp file, then renamed).'''
+    path = partition_path(coin, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.tmp'
+    pq.write_table(to_table(df), tmp)
+    os.replace(tmp, path)
+
+
+def append_series(coin, df, root=STORE_DIR):
+    '''Merge new rows into a coin's partition; rows for dates already stored are replaced.'''
+    if os.path.exists(partition_path(coin, root)):
+        df = pd.concat([read_series(coin, root), df], ignore_index=True)
+    write_series(coin, df, root)
+
+
+def read_series(coin, root=STORE_DIR, memory_map=False):
+    '''One coin as DataFrame[date (datetime64), price (float64)].
+
+    memory_map=True reads the file through mmap instead of buffered reads, which
+    avoids an extra copy when the same partitions are read repeatedly.
+    '''
+    return pq.read_table(partition_path(coin, root), memory_map=memory_map).to_pandas()
+
+
+def read_prices(coins=None, root=STORE_DIR, memory_map=False):
+    '''Several coins as one long DataFrame[date, price, coin]; all stored coins by default.'''
+    frames = []
+    for coin in coins or stored_coins(root):
+        df = read_series(coin, root, memory_map)
+        df['coin'] = coin
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'), 'price': pd.Series(dtype='float64'),
+                             'coin': pd.Series(dtype='object')})
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_series(coin, root=STORE_DIR, csv_path=None, memory_map=False):
+    '''Read a coin from the store, falling back to a CSV (parsed and typed the same way).'''
+    if os.path.exists(partition_path(coin, root)):
+        return read_series(coin, root, memory_map)
+    return to_table(pd.read_csv(csv_path or f'{coin}.csv')).to_pandas()
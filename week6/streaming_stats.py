@@ -0,0 +1,309 @@
+'''Streaming statistics for price feeds.
+
+Every update is O(1) and only the last `window` ticks are kept, so a minute-level
+feed can be monitored indefinitely; `StreamMonitor.save` / `load` checkpoint the
+state so a restart picks up where it left off instead of replaying history.
+
+    monitor = StreamMonitor(['bitcoin', 'ethereum'], window=60)
+    monitor.update('2025-09-08T12:00', {'bitcoin': 111130.5, 'ethereum': 4304.0})
+    print(monitor.snapshot())
+'''
+import argparse
+import json
+import math
+import os
+from collections import deque
+
+import pandas as pd
+
+
+class RollingStats:
+    '''Mean/variance (Welford), min and max over the last `window` values.
+
+    The value leaving the window is removed from the mean and M2 (Welford
+    add/remove), and min/max come from monotonic deques whose fronts are the
+    current extremes, so each update is O(1) amortized whatever the window.
+    '''
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.seen = 0  # values ever added; indexes the min/max candidates
+        self.mins = deque()  # (index, value), values increasing
+        self.maxs = deque()  # (index, value), values decreasing
+
+    @property
+    def count(self):
+        return len(self.values)
+
+    def update(self, x):
+        self.values.append(x)
+        n = len(self.values)
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+        if n > self.window:
+            old = self.values.popleft()
+            n -= 1
+            delta = old - self.mean
+            self.mean -= delta / n
+            self.m2 -= delta * (old - self.mean)
+
+        while self.mins and self.mins[-1][1] >= x:
+            self.mins.pop()
+        while self.maxs and self.maxs[-1][1] <= x:
+            self.maxs.pop()
+        self.mins.append((self.seen, x))
+        self.maxs.append((self.seen, x))
+        self.seen += 1
+        oldest = self.seen - len(self.values)
+        for extremes in (self.mins, self.maxs):
+            if extremes[0][0] < oldest:
+                extremes.popleft()
+
+    @property
+    def min(self):
+        return self.mins[0][1] if self.mins else math.nan
+
+    @property
+    def max(self):
+        return self.maxs[0][1] if self.maxs else math.nan
+
+    @property
+    def variance(self):
+        # Sample variance, same as pandas' rolling std() default (ddof=1); clamped at 0 against rounding.
+        return max(self.m2, 0.0) / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        return {'window': self.window, 'values': list(self.values), 'mean': self.mean, 'm2': self.m2,
+                'seen': self.seen, 'mins': list(self.mins), 'maxs': list(self.maxs)}
+
+    @classmethod
+    def from_dict(cls, data):
+        obj = cls(data['window'])
+        obj.values = deque(data['values'])
+        obj.mean, obj.m2, obj.seen = data['mean'], data['m2'], data['seen']
+        obj.mins = deque(tuple(p) for p in data['mins'])
+        obj.maxs = deque(tuple(p) for p in data['maxs'])
+        return obj
+
+
+class EWMAVolatility:
+    '''Exponentially weighted volatility of returns: var = lam * var + (1 - lam) * r**2 (RiskMetrics).'''
+
+    def __init__(self, lam=0.94):
+        self.lam = lam
+        self.var = None
+
+    def update(self, r):
+        self.var = r * r if self.var is None else self.lam * self.var + (1 - self.lam) * r * r
+
+    @property
+    def vol(self):
+        return math.sqrt(self.var) if self.var is not None else math.nan
+
+    def to_dict(self):
+        return {'lam': self.lam, 'var': self.var}
+
+    @classmethod
+    def from_dict(cls, data):
+        obj = cls(data['lam'])
+        obj.var = data['var']
+        return obj
+
+
+class RollingCorrelation:
+    '''Correlation of paired values over the last `window` pairs.
+
+    Means and co-moments are updated for the pair entering and the pair leaving
+    the window (Welford add/remove), so each update is O(1) whatever the window.
+    '''
+
+    def __init__(self, window):
+        self.window = window
+        self.pairs = deque()
+        self.mean_x = self.mean_y = 0.0
+        self.cxx = self.cyy = self.cxy = 0.0
+
+    def _add(self, x, y):
+        n = len(self.pairs)
+        dx = x - self.mean_x
+        self.mean_x += dx / n
+        dy = y - self.mean_y
+        self.mean_y += dy / n
+        self.cxx += dx * (x - self.mean_x)
+        self.cyy += dy * (y - self.mean_y)
+        self.cxy += dx * (y - self.mean_y)
+
+    def _remove(self, x, y):
+        n = len(self.pairs)
+        if n == 0:
+            self.mean_x = self.mean_y = self.cxx = self.cyy = self.cxy = 0.0
+            return
+        dx = x - self.mean_x
+        self.mean_x -= dx / n
+        dy = y - self.mean_y
+        self.mean_y -= dy / n
+        self.cxx -= dx * (x - self.mean_x)
+        self.cyy -= dy * (y - self.mean_y)
+        self.cxy -= dx * (y - self.mean_y)
+
+    def update(self, x, y):
+        self.pairs.append((x, y))
+        self._add(x, y)
+        if len(self.pairs) > self.window:
+            self._remove(*self.pairs.popleft())
+
+    @property
+    def corr(self):
+        if len(self.pairs) < 2 or self.cxx <= 0 or self.cyy <= 0:
+            return math.nan
+        return self.cxy / math.sqrt(self.cxx * self.cyy)
+
+    def to_dict(self):
+        return {'window': self.window, 'pairs': list(self.pairs), 'mean_x': self.mean_x, 'mean_y': self.mean_y,
+                'cxx': self.cxx, 'cyy': self.cyy, 'cxy': self.cxy}
+
+    @classmethod
+    def from_dict(cls, data):
+        obj = cls(data['window'])
+        obj.pairs = deque(tuple(p) for p in data['pairs'])
+        for key in ('mean_x', 'mean_y', 'cxx', 'cyy', 'cxy'):
+            setattr(obj, key, data[key])
+        return obj
+
+
+def parse_timestamp(timestamp):
+    '''Anything pd.Timestamp accepts -> naive UTC Timestamp, so ticks compare by time rather than as text.'''
+    ts = pd.Timestamp(timestamp)
+    return ts.tz_convert('UTC').tz_localize(None) if ts.tzinfo is not None else ts
+
+
+class StreamMonitor:
+    '''Per-coin price and return stats over the last `window` ticks, EWMA volatility, and each
+    coin's rolling return correlation with `benchmark`.
+
+    `update(timestamp, {coin: price})` takes one tick; coins missing from a tick
+    are skipped, and correlation only uses ticks where both coins have a return.
+    Ticks at or before the last timestamp seen are ignored, so replaying a feed
+    after a restart is safe.
+    '''
+
+    def __init__(self, coins, window=60, benchmark=None, lam=0.94):
+        self.coins = list(coins)
+        self.window = window
+        self.benchmark = benchmark or self.coins[0]
+        self.last_timestamp = None
+        self.last_price = {c: None for c in self.coins}
+        self.prices = {c: RollingStats(window) for c in self.coins}
+        self.returns = {c: RollingStats(window) for c in self.coins}
+        self.ewma = {c: EWMAVolatility(lam) for c in self.coins}
+        self.corr = {c: RollingCorrelation(window) for c in self.coins if c != self.benchmark}
+
+    def update(self, timestamp, prices):
+        timestamp = parse_timestamp(timestamp)
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return False
+        self.last_timestamp = timestamp
+        rets = {}
+        for coin, price in prices.items():
+            if coin not in self.prices or price is None or math.isnan(price):
+                continue
+            prev = self.last_price[coin]
+            if prev:
+                r = price / prev - 1
+                rets[coin] = r
+                self.returns[coin].update(r)
+                self.ewma[coin].update(r)
+            self.prices[coin].update(price)
+            self.last_price[coin] = price
+        bench = rets.get(self.benchmark)
+        if bench is not None:
+            for coin, tracker in self.corr.items():
+                if coin in rets:
+                    tracker.update(bench, rets[coin])
+        return True
+
+    def snapshot(self):
+        '''{coin: current metrics}; plain floats, NaN where there is not enough data yet.'''
+        out = {}
+        for coin in self.coins:
+            p = self.prices[coin]
+            out[coin] = {
+                'count': p.count,
+                'last': self.last_price[coin],
+                'mean': p.mean if p.count else math.nan,
+                'min': p.min,
+                'max': p.max,
+                'std': p.std,
+                'return_std': self.returns[coin].std,
+                'ewma_vol': self.ewma[coin].vol,
+                f'corr_{self.benchmark}': self.corr[coin].corr if coin in self.corr else 1.0,
+            }
+        return out
+
+    def to_dict(self):
+        return {
+            'coins': self.coins, 'window': self.window, 'benchmark': self.benchmark,
+            'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+            'last_price': self.last_price,
+            'prices': {c: s.to_dict() for c, s in self.prices.items()},
+            'returns': {c: s.to_dict() for c, s in self.returns.items()},
+            'ewma': {c: s.to_dict() for c, s in self.ewma.items()},
+            'corr': {c: s.to_dict() for c, s in self.corr.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        obj = cls(data['coins'], data['window'], data['benchmark'])
+        obj.last_timestamp = parse_timestamp(data['last_timestamp']) if data['last_timestamp'] else None
+        obj.last_price = data['last_price']
+        obj.prices = {c: RollingStats.from_dict(s) for c, s in data['prices'].items()}
+        obj.returns = {c: RollingStats.from_dict(s) for c, s in data['returns'].items()}
+        obj.ewma = {c: EWMAVolatility.from_dict(s) for c, s in data['ewma'].items()}
+        obj.corr = {c: RollingCorrelation.from_dict(s) for c, s in data['corr'].items()}
+        return obj
+
+    def save(self, path):
+        # Write-then-rename so a crash mid-write never leaves a truncated checkpoint.
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+if __name__ == '__main__':
+    import price_store
+
+    parser = argparse.ArgumentParser(description='Feed stored prices through the streaming monitor, resuming '
+                                                 'from a checkpoint so only new points are processed.')
+    parser.add_argument('--coins', nargs='+', default=['bitcoin', 'ethereum'])
+    parser.add_argument('--window', type=int, default=60, help='ticks in the stats and correlation window')
+    parser.add_argument('--checkpoint', default='stream_state.json')
+    parser.add_argument('--store', default=price_store.STORE_DIR)
+    args = parser.parse_args()
+
+    if os.path.exists(args.checkpoint):
+        monitor = StreamMonitor.load(args.checkpoint)
+    else:
+        monitor = StreamMonitor(args.coins, args.window)
+    wide = price_store.read_prices(monitor.coins, args.store).pivot_table(index='date', columns='coin', values='price')
+    if monitor.last_timestamp is not None:
+        wide = wide[wide.index > monitor.last_timestamp]
+    for ts, row in zip(wide.index, wide.to_dict('records')):
+        monitor.update(ts, row)
+    monitor.save(args.checkpoint)
+    print(f'{len(wide)} new ticks, up to {monitor.last_timestamp}')
+    for coin, stats in monitor.snapshot().items():
+        print(coin, {k: round(v, 4) if isinstance(v, float) else v for k, v in stats.items()})
@@ -0,0 +1,152 @@
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import crypto  # noqa: E402
+
+DAY_MS = 86_400_000
+
+
+class FakeCoinGecko:
+    '''Daily points for every requested range, both ends included, like CoinGecko for ranges over 90 days.
+
+    Price is the day number since 1970 plus a per-coin offset, so every stitched row can be checked.
+    Earlier windows answer more slowly, so futures complete out of order.
+    '''
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get_coin_market_chart_range_by_id(self, id, vs_currency, from_timestamp, to_timestamp):
+        with self.lock:
+            self.calls.append((id, from_timestamp, to_timestamp))
+        time.sleep(max(0, 1_700_000_000 - from_timestamp) / 1e10)
+        days = range(from_timestamp * 1000 // DAY_MS, to_timestamp * 1000 // DAY_MS + 1)
+        offset = 0.5 if id == 'ethereum' else 0.0
+        # Two points per day (midnight and noon), as for ranges where the API is less coarse.
+        return {'prices': [[d * DAY_MS + h, d + offset + h / DAY_MS] for d in days for h in (0, DAY_MS // 2)]}
+
+
+def _days(start, end):
+    return [date.fromisoformat(start) + timedelta(days=i)
+            for i in range((date.fromisoformat(end) - date.fromisoformat(start)).days + 1)]
+
+
+def test_split_windows_covers_the_range_without_gaps():
+    windows = crypto.split_windows('2020-01-01', '2021-06-30', window_days=100)
+    assert windows[0][0] == crypto.to_timestamp('2020-01-01')
+    assert windows[-1][1] == crypto.to_timestamp('2021-06-30')
+    for (_, prev_end), (start, _) in zip(windows, windows[1:]):
+        assert start == prev_end  # consecutive windows share their boundary day
+    assert all(end - start <= 100 * 86_400 for start, end in windows)
+    # Windows never shrink below the size that keeps daily granularity.
+    short = crypto.split_windows('2020-01-01', '2020-12-31', window_days=10)
+    assert all(end - start == crypto.MIN_WINDOW_DAYS * 86_400 for start, end in short[:-1])
+    assert crypto.split_windows('2020-01-01', '2020-01-01') == []
+
+
+def test_download_ranges_merges_windows_in_order_without_duplicates():
+    client = FakeCoinGecko()
+    ranges = {'bitcoin': ('2019-01-01', '2021-03-15'), 'ethereum': ('2020-06-01', '2020-12-31')}
+    frames = crypto.download_ranges(ranges, 'usd', client=client, window_days=120,
+                                    max_workers=4, calls_per_minute=0)
+
+    for coin, (start, end) in ranges.items():
+        df = frames[coin]
+        expected_days = _days(start, end)
+        assert df['date'].tolist() == expected_days
+        assert df['date'].is_unique
+        # First point of each day is kept, so prices are the whole day numbers.
+        offset = 0.5 if coin == 'ethereum' else 0.0
+        epoch = date(1970, 1, 1)
+        assert df['price'].tolist() == [(d - epoch).days + offset for d in expected_days]
+        windows = crypto.split_windows(start, end, 120)
+        assert sorted((f, t) for c, f, t in client.calls if c == coin) == windows
+    assert len(client.calls) == sum(len(crypto.split_windows(s, e, 120)) for s, e in ranges.values())
+
+
+def test_download_histories_uses_one_range_for_every_coin():
+    frames = crypto.download_histories(['bitcoin', 'ethereum'], 'usd', '2021-01-01', '2021-05-01',
+                                       client=FakeCoinGecko(), window_days=91, calls_per_minute=0)
+    assert set(frames) == {'bitcoin', 'ethereum'}
+    assert all(isinstance(df, pd.DataFrame) and len(df) == len(_days('2021-01-01', '2021-05-01'))
+               for df in frames.values())
+
+
+def test_incremental_update_seeds_a_missing_partition_from_the_csv(tmp_path):
+    import price_store
+
+    old = crypto.download_ranges({'bitcoin': ('2021-01-01', '2021-06-01')}, 'usd', client=FakeCoinGecko(),
+                                 calls_per_minute=0)['bitcoin']
+    old.to_csv(tmp_path / 'bitcoin.csv', index=False)
+    store = tmp_path / 'prices'
+
+    added = crypto.update_incremental(['bitcoin'], 'usd', '2021-01-01', '2021-09-01', directory=str(tmp_path),
+                                      store=str(store), client=FakeCoinGecko(), calls_per_minute=0)
+
+    assert added == {'bitcoin': len(_days('2021-06-02', '2021-09-01'))}
+    stored = price_store.load_series('bitcoin', str(store))
+    assert stored['date'].dt.date.tolist() == _days('2021-01-01', '2021-09-01')
+    assert pd.read_csv(tmp_path / 'bitcoin.csv')['date'].tolist() == [str(d) for d in _days('2021-01-01', '2021-09-01')]
+
+    # Once the partition exists, later runs only merge the new rows into it.
+    crypto.update_incremental(['bitcoin'], 'usd', '2021-01-01', '2021-09-10', directory=str(tmp_path),
+                              store=str(store), client=FakeCoinGecko(), calls_per_minute=0)
+    assert price_store.load_series('bitcoin', str(store))['date'].dt.date.tolist() == _days('2021-01-01', '2021-09-10')
+
+
+def test_incremental_after_full_download_starts_from_the_new_csv(tmp_path):
+    kwargs = dict(directory=str(tmp_path), client=FakeCoinGecko(), calls_per_minute=0)
+    crypto.update_incremental(['bitcoin'], 'usd', '2021-01-01', '2021-06-01', **kwargs)
+    # The full download rewrites the CSV up to September; the June watermark must not survive it.
+    crypto.download_full(['bitcoin'], 'usd', '2021-01-01', '2021-09-01', **kwargs)
+    assert crypto.read_watermark('bitcoin', str(tmp_path)) == '2021-09-01'
+
+    added = crypto.update_incremental(['bitcoin'], 'usd', '2021-01-01', '2021-10-01', **kwargs)
+
+    dates = pd.read_csv(tmp_path / 'bitcoin.csv')['date'].tolist()
+    assert dates == [str(d) for d in _days('2021-01-01', '2021-10-01')]
+    assert added == {'bitcoin': len(_days('2021-09-02', '2021-10-01'))}
+
+
+def test_incremental_dedupes_against_the_csv_when_the_watermark_is_stale(tmp_path):
+    kwargs = dict(directory=str(tmp_path), client=FakeCoinGecko(), calls_per_minute=0)
+    crypto.update_incremental(['bitcoin'], 'usd', '2021-01-01', '2021-06-01', **kwargs)
+    crypto.write_watermark('bitcoin', '2021-03-01', 0, str(tmp_path))
+
+    crypto.update_incremental(['bitcoin'], 'usd', '2021-01-01', '2021-07-01', **kwargs)
+
+    dates = pd.read_csv(tmp_path / 'bitcoin.csv')['date']
+    assert dates.is_unique and dates.tolist() == [str(d) for d in _days('2021-01-01', '2021-07-01')]
+
+
+def test_download_ranges_keeps_other_coins_when_one_fails(monkeypatch):
+    import pytest
+
+    class FlakyCoinGecko(FakeCoinGecko):
+        def get_coin_market_chart_range_by_id(self, id, **kwargs):
+            if id == 'not-a-coin':
+                raise ValueError('coin not found')
+            return super().get_coin_market_chart_range_by_id(id, **kwargs)
+
+    monkeypatch.setattr(crypto.time, 'sleep', lambda seconds: None)  # skip retry backoff
+    ranges = {coin: ('2021-01-01', '2021-12-31') for coin in ('bitcoin', 'not-a-coin', 'ethereum')}
+
+    failures = {}
+    frames = crypto.download_ranges(ranges, 'usd', client=FlakyCoinGecko(), calls_per_minute=0, failures=failures)
+    assert set(frames) == {'bitcoin', 'ethereum'}
+    assert list(failures) == ['not-a-coin'] and 'coin not found' in str(failures['not-a-coin'])
+
+    with pytest.raises(crypto.DownloadError, match='not-a-coin') as excinfo:
+        crypto.download_ranges(ranges, 'usd', client=FlakyCoinGecko(), calls_per_minute=0)
+    assert set(excinfo.value.failed) == {'not-a-coin'}
+    assert set(excinfo.value.frames) == {'bitcoin', 'ethereum'}
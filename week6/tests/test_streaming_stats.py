@@ -0,0 +1,58 @@
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from streaming_stats import RollingStats, StreamMonitor  # noqa: E402
+
+
+def _prices(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-01', periods=n, freq='D')
+    return pd.DataFrame({'bitcoin': 40_000 * np.exp(np.cumsum(rng.normal(0, 0.03, n))),
+                         'ethereum': 2_000 * np.exp(np.cumsum(rng.normal(0, 0.04, n)))}, index=dates)
+
+
+def test_rolling_stats_match_pandas_rolling_window():
+    values = _prices()['bitcoin']
+    stats = RollingStats(30)
+    rolling = values.rolling(30, min_periods=1)
+    for x, mean, std, lo, hi in zip(values, rolling.mean(), rolling.std(), rolling.min(), rolling.max()):
+        stats.update(x)
+        assert math.isclose(stats.mean, mean, rel_tol=1e-9)
+        assert (math.isnan(std) and math.isnan(stats.std)) or math.isclose(stats.std, std, rel_tol=1e-6)
+        assert (stats.min, stats.max) == (lo, hi)
+    assert stats.count == 30
+
+
+def test_monitor_matches_pandas_and_resumes_from_checkpoint(tmp_path):
+    prices = _prices()
+    window = 45
+    first = StreamMonitor(['bitcoin', 'ethereum'], window=window)
+    for ts, row in zip(prices.index[:250], prices.iloc[:250].to_dict('records')):
+        first.update(ts, row)
+    first.save(tmp_path / 'state.json')
+
+    resumed = StreamMonitor.load(tmp_path / 'state.json')
+    # Replayed ticks are skipped, whatever form the timestamp takes.
+    assert not resumed.update('2024-01-05T00:00:00+00:00', prices.iloc[4].to_dict())
+    assert not resumed.update(prices.index[249].to_pydatetime(), prices.iloc[249].to_dict())
+    for ts, row in zip(prices.index.strftime('%Y-%m-%dT%H:%M'), prices.to_dict('records')):
+        resumed.update(ts, row)
+
+    snap = resumed.snapshot()
+    tail = prices.tail(window)
+    returns = prices.pct_change().tail(window)
+    for coin in prices:
+        assert snap[coin]['count'] == window
+        assert math.isclose(snap[coin]['mean'], tail[coin].mean(), rel_tol=1e-9)
+        assert math.isclose(snap[coin]['std'], tail[coin].std(), rel_tol=1e-6)
+        assert (snap[coin]['min'], snap[coin]['max']) == (tail[coin].min(), tail[coin].max())
+        assert math.isclose(snap[coin]['return_std'], returns[coin].std(), rel_tol=1e-6)
+    assert math.isclose(snap['ethereum']['corr_bitcoin'], returns['ethereum'].corr(returns['bitcoin']), rel_tol=1e-6)
@@ -1,47 +1,73 @@
+import os
+import sys
+
 import pandas as pd
-import matplotlib
-import matplotlib.pyplot as plt
 
-matplotlib.use('Agg')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import chart_render  # noqa: E402
+import figure_jobs  # noqa: E402
+import price_store  # noqa: E402
+
+# points per line after downsampling (LTTB); None plots every point
+MAX_POINTS = 2000
+COINS = {'bitcoin': 'Bitcoin', 'ethereum': 'Ethereum'}
 
-# LOAD CLEANED DATA
-bitcoin = pd.read_csv('bitcoin_cleaned.csv')
-ethereum = pd.read_csv('ethereum_cleaned.csv')
+# LOAD DATA: Parquet store (typed, no date parsing) or the cleaned CSVs next to this script
+frames = {
+    coin: price_store.load_series(coin, csv_path=f'{coin}_cleaned.csv', memory_map=True).sort_values('date')
+    for coin in COINS
+}
 
-# ensure datetime + sorted by date
-bitcoin['date'] = pd.to_datetime(bitcoin['date'])
-ethereum['date'] = pd.to_datetime(ethereum['date'])
-bitcoin = bitcoin.sort_values('date')
-ethereum = ethereum.sort_values('date')
+# ALIGN DATA BY DATE: one price column per coin, dates every coin has
+merged = frames['bitcoin'][['date']]
+for coin, df in frames.items():
+    merged = pd.merge(merged, df.rename(columns={'price': coin}), on='date', how='inner')
 
-# ALIGN DATA BY DATE
-merged = pd.merge(bitcoin, ethereum, on='date', how='inner', suffixes=('_btc', '_eth'))
 
 # 1) LINE CHART: PRICE TRENDS
-plt.figure(figsize=(10, 6))
-plt.plot(merged['date'], merged['price_btc'], label='Bitcoin', linewidth=2)
-plt.plot(merged['date'], merged['price_eth'], label='Ethereum', linewidth=2)
-plt.title('Price Trends: Bitcoin vs Ethereum')
-plt.xlabel('Date')
-plt.ylabel('Price (USD)')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('crypto_price_trends.png', dpi=150)
-plt.close()
+def draw_price_trends(ax, lines):
+    for label, (dates, prices) in lines.items():
+        ax.plot(dates, prices, label=label, linewidth=2)
+    ax.set_title('Price Trends: ' + ' vs '.join(lines))
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Price (USD)')
+    ax.legend()
+    ax.grid(True)
+
 
 # 2) HISTOGRAM: DAILY RETURNS (VOLATILITY)
-returns = merged[['price_btc', 'price_eth']].pct_change().dropna()
-
-plt.figure(figsize=(10, 6))
-plt.hist(returns['price_btc'], bins=50, alpha=0.6, label='Bitcoin')
-plt.hist(returns['price_eth'], bins=50, alpha=0.6, label='Ethereum')
-plt.title('Histogram of Daily Returns: Bitcoin vs Ethereum')
-plt.xlabel('Daily Return')
-plt.ylabel('Frequency')
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.savefig('crypto_returns_hist.png', dpi=150)
-plt.close()
+returns = merged[list(COINS)].pct_change().dropna()
+
+
+def draw_returns_hist(ax, returns):
+    # A histogram already aggregates, so it needs no downsampling.
+    for coin, label in COINS.items():
+        ax.hist(returns[coin], bins=50, alpha=0.6, label=label)
+    ax.set_title('Histogram of Daily Returns: ' + ' vs '.join(COINS.values()))
+    ax.set_xlabel('Daily Return')
+    ax.set_ylabel('Frequency')
+    ax.legend()
+    ax.grid(True)
+
+
+# each chart is redrawn only when its data or options changed since the last run
+charts = [
+    ('crypto_price_trends.png', draw_price_trends, {'prices': merged}, {'max_points': MAX_POINTS, 'coins': COINS},
+     lambda: {label: chart_render.downsample(merged['date'], merged[coin], MAX_POINTS)
+              for coin, label in COINS.items()}),
+    ('crypto_returns_hist.png', draw_returns_hist, {'returns': returns}, {'bins': 50, 'coins': COINS},
+     lambda: returns),
+]
+jobs, keys = [], {}
+for path, draw, data, options, prepare in charts:
+    key = chart_render.data_key(data, options)
+    if chart_render.needs_render(path, key):
+        jobs.append(figure_jobs.job(path, draw, prepare(), figsize=(10, 6), dpi=150))
+        keys[path] = key
+    else:
+        print(f'{path}: unchanged, skipped')
 
+for path in figure_jobs.run_jobs(jobs):
+    chart_render.mark_rendered(path, keys[path])
+    print(f'{path}: rendered')